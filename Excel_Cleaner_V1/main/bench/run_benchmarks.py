@@ -0,0 +1,214 @@
+import os
+import sys
+import json
+import time
+import queue
+import shutil
+import argparse
+import datetime
+import platform
+import tempfile
+import threading
+import subprocess
+import importlib.util
+
+from synthetic import generate_workbook
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, "..", "src")
+SHEET_CLEANER_MAIN = os.path.join(BENCH_DIR, "..", "..", "..", "SheetCleaner", "main", "scanner.py")
+CASES = ["excel_process_file", "excel_process_all_files", "sheetcleaner_scan_file"]
+
+class PhaseTimer:
+    # Accumulates wall time per phase; safe to use from worker threads.
+    def __init__(self):
+        self.phases = {"read": 0.0, "scan": 0.0, "write": 0.0}
+        self._lock = threading.Lock()
+
+    def wrap(self, fn, phase):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.phases[phase] += time.perf_counter() - start
+        return timed
+
+def peak_rss_mb():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes on Linux.
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+def git_version():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def import_cleaner(workdir):
+    # cleaner.py reads config.json at import time, so point config_manager at
+    # a copy whose input/output folders live in the benchmark directory.
+    sys.path.insert(0, SRC_DIR)
+    import config_manager
+    config = config_manager.load_config()
+    config["input_folder"] = os.path.join(workdir, "input")
+    config["output_folder"] = os.path.join(workdir, "output")
+    bench_config = os.path.join(workdir, "config.json")
+    with open(bench_config, "w", encoding="utf-8") as f:
+        json.dump(config, f, ensure_ascii=False)
+    config_manager.CONFIG_FILE = bench_config
+    import cleaner
+    return cleaner
+
+def instrument_cleaner(cleaner, timer):
+    cleaner.read_sheet = timer.wrap(cleaner.read_sheet, "read")
+    cleaner.scan_frame = timer.wrap(cleaner.scan_frame, "scan")
+    cleaner.save_cleaned_workbook = timer.wrap(cleaner.save_cleaned_workbook, "write")
+
+def run_excel_process_file(workdir, timer):
+    cleaner = import_cleaner(workdir)
+    instrument_cleaner(cleaner, timer)
+    results, summary = cleaner.process_file(os.path.join(workdir, "workbook.xlsx"), True, False)
+    return summary["total_cells"]
+
+def run_excel_process_all_files(workdir, timer, workers=None, report_format="xlsx"):
+    cleaner = import_cleaner(workdir)
+    instrument_cleaner(cleaner, timer)
+    with cleaner.open_report_sink(cleaner.OUTPUT_FOLDER, report_format) as sink:
+        sink.write = timer.wrap(sink.write, "write")
+        summary = cleaner.process_all_files(True, False, sink, workers, "thread")
+        timer.wrap(sink.close, "write")(summary)
+    return summary["total_cells"]
+
+def run_sheetcleaner_scan_file(workdir, timer):
+    # Drives SheetCleaner's headless scanner through scan_file, the path its
+    # CLI and GUI use, and counts the cells of every page handed to
+    # process_df, so cells/sec covers exactly what was scanned.
+    spec = importlib.util.spec_from_file_location("sheet_scanner", SHEET_CLEANER_MAIN)
+    scanner = importlib.util.module_from_spec(spec)
+    sys.path.insert(0, os.path.dirname(SHEET_CLEANER_MAIN))
+    spec.loader.exec_module(scanner)
+    process_df = timer.wrap(scanner.process_df, "scan")
+    cells = 0
+
+    def counted_process_df(file_name, sheet_name, df, results, log_queue):
+        nonlocal cells
+        cells += df.size
+        process_df(file_name, sheet_name, df, results, log_queue)
+
+    start = time.perf_counter()
+    scanner.scan_file(os.path.join(workdir, "workbook.xlsx"), scanner.load_sheets, counted_process_df, [],
+                      queue.Queue())
+    # Pages are read lazily between process_df calls, so reading is the rest.
+    timer.phases["read"] += time.perf_counter() - start - timer.phases["scan"]
+    return cells
+
+def run_case(name, workdir, args):
+    timer = PhaseTimer()
+    start = time.perf_counter()
+    if name == "excel_process_file":
+        cells = run_excel_process_file(workdir, timer)
+    elif name == "excel_process_all_files":
+        cells = run_excel_process_all_files(workdir, timer, args.workers, args.report_format)
+    elif name == "sheetcleaner_scan_file":
+        cells = run_sheetcleaner_scan_file(workdir, timer)
+    else:
+        raise ValueError(f"Unknown case: {name}")
+    seconds = time.perf_counter() - start
+    return {
+        "case": name,
+        "cells": int(cells),
+        "seconds": seconds,
+        "cells_per_sec": cells / seconds if seconds else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "phases": timer.phases,
+    }
+
+def generate_inputs(workdir, args):
+    params = dict(rows=args.rows, columns=args.columns, sheets=args.sheets,
+                  accent_density=args.accent_density, non_latin_density=args.non_latin_density,
+                  special_density=args.special_density, distinct_values=args.distinct_values,
+                  emplid=not args.no_emplid)
+    os.makedirs(os.path.join(workdir, "input"), exist_ok=True)
+    os.makedirs(os.path.join(workdir, "output"), exist_ok=True)
+    generate_workbook(os.path.join(workdir, "workbook.xlsx"), seed=args.seed, **params)
+    for i in range(args.files):
+        generate_workbook(os.path.join(workdir, "input", f"input_{i + 1}.xlsx"), seed=args.seed + i + 1, **params)
+    return params
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput benchmarks for Excel_Cleaner_V1 and SheetCleaner.")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--sheets", type=int, default=1)
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--accent_density", type=float, default=0.2)
+    parser.add_argument("--non_latin_density", type=float, default=0.05)
+    parser.add_argument("--special_density", type=float, default=0.05)
+    parser.add_argument("--distinct_values", type=int, default=5000)
+    parser.add_argument("--no_emplid", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--report_format", default="xlsx")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=CASES)
+    parser.add_argument("--output", default=os.path.join(BENCH_DIR, "bench_results.json"))
+    parser.add_argument("--workdir", default=None)
+    parser.add_argument("--run_case", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        # Child mode: one case per process, so peak RSS is not shared between cases.
+        print(json.dumps(run_case(args.run_case, args.workdir, args)))
+        return
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="cleaner_bench_")
+    try:
+        params = generate_inputs(workdir, args)
+        cases = []
+        for name in args.cases:
+            shutil.rmtree(os.path.join(workdir, "output"), ignore_errors=True)
+            os.makedirs(os.path.join(workdir, "output"))
+            command = [sys.executable, os.path.abspath(__file__), "--run_case", name, "--workdir", workdir,
+                       "--report_format", args.report_format]
+            if args.workers:
+                command += ["--workers", str(args.workers)]
+            proc = subprocess.run(command, capture_output=True, text=True, encoding="utf-8")
+            if proc.returncode != 0:
+                print(f"{datetime.datetime.now()} - {name} failed:\n{proc.stderr}")
+                cases.append({"case": name, "error": proc.stderr.strip().splitlines()[-1:]})
+                continue
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            cases.append(result)
+            print(f"{datetime.datetime.now()} - {name}: {result['cells']} cells in {result['seconds']:.2f}s "
+                  f"({result['cells_per_sec']:.0f} cells/s), peak RSS {result['peak_rss_mb']} MB")
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+    report = {
+        "timestamp": datetime.datetime.now().isoformat(),
+        "version": git_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": dict(params, files=args.files, seed=args.seed, workers=args.workers,
+                       report_format=args.report_format),
+        "cases": cases,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+    print(f"{datetime.datetime.now()} - Benchmark results saved: {args.output}")
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -0,0 +1,65 @@
+import os
+import csv
+import random
+
+# Building blocks for synthetic cell values. Accented letters are allowed by
+# the default config; non-Latin letters and the special characters are not,
+# so they end up flagged and stripped.
+WORDS = ["Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit", "Durand",
+         "Leroy", "Moreau", "Simon", "Laurent", "Lefebvre", "Michel", "Garcia", "David",
+         "Paris", "Lyon", "Marseille", "Toulouse", "Nantes", "Service", "Finance", "Ventes"]
+ACCENTS = "éèêëàâäçîïôöùûüÉÈÀÇ"
+NON_LATIN = "ДЖЯЩαβγδλΩ中文字東京한국"
+SPECIALS = "!@#$%^&*()_+=[]{}|;:\"<>?/~`€£"
+
+def make_value(rng, accent_density, non_latin_density, special_density):
+    chars = list(rng.choice(WORDS) + " " + rng.choice(WORDS))
+    for pool, density in ((ACCENTS, accent_density), (NON_LATIN, non_latin_density), (SPECIALS, special_density)):
+        if rng.random() < density:
+            chars.insert(rng.randrange(len(chars) + 1), rng.choice(pool))
+    return "".join(chars)
+
+def make_vocabulary(rng, distinct_values, accent_density, non_latin_density, special_density):
+    return [make_value(rng, accent_density, non_latin_density, special_density) for _ in range(distinct_values)]
+
+def iter_rows(rng, rows, columns, vocabulary, emplid):
+    for i in range(rows):
+        row = [rng.choice(vocabulary) for _ in range(columns)]
+        if emplid:
+            row[0] = str(100000 + i)
+        yield row
+
+def header(columns, emplid):
+    names = [f"Column {i + 1}" for i in range(columns)]
+    if emplid:
+        names[0] = "EMPLID"
+    return names
+
+def generate_workbook(path, rows=10000, columns=10, sheets=1, accent_density=0.2,
+                      non_latin_density=0.05, special_density=0.05, distinct_values=5000,
+                      emplid=True, seed=0):
+    """Write a synthetic .xlsx or .csv file and return the number of data cells.
+
+    Values are drawn from a vocabulary of distinct_values strings, so the
+    ratio of rows * columns to distinct_values controls how much the cell
+    cache can help. The first column holds unique EMPLIDs when emplid is set.
+    A .csv path always gets a single sheet.
+    """
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng, max(distinct_values, 1), accent_density, non_latin_density, special_density)
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header(columns, emplid))
+            writer.writerows(iter_rows(rng, rows, columns, vocabulary, emplid))
+        return rows * columns
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    for sheet in range(sheets):
+        ws = wb.create_sheet(f"Sheet{sheet + 1}")
+        ws.append(header(columns, emplid))
+        for row in iter_rows(rng, rows, columns, vocabulary, emplid):
+            ws.append(row)
+    wb.save(path)
+    return rows * columns * sheets
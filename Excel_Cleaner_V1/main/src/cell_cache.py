@@ -0,0 +1,62 @@
+import threading
+from collections import OrderedDict
+
+class CellCache:
+    """Bounded LRU map from a raw cell string to its cleaned value.
+
+    A single instance is shared by every process_all_files worker thread, so
+    all access to the underlying OrderedDict goes through one lock. Values are
+    computed outside the lock; two threads missing on the same key at once
+    simply both compute it.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max(int(max_size or 0), 0)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys, compute, occurrences=None):
+        # keys must be unique; occurrences[i] is how many cells hold keys[i],
+        # so repeats of a missed key within the same batch count as hits.
+        # Returns (mapping, hits, misses) for this call.
+        if occurrences is None:
+            occurrences = [1] * len(keys)
+        found = {}
+        missing = []
+        hits = 0
+        misses = 0
+        with self._lock:
+            for key, count in zip(keys, occurrences):
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+                    hits += int(count)
+                else:
+                    missing.append(key)
+                    misses += 1
+                    hits += int(count) - 1
+        if missing:
+            computed = dict(zip(missing, compute(missing)))
+            found.update(computed)
+            if self.max_size:
+                with self._lock:
+                    for key, value in computed.items():
+                        self._entries[key] = value
+                        self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+        return found, hits, misses
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,51 @@
+import re
+import array
+import functools
+
+@functools.lru_cache(maxsize=None)
+def allowed_bmp(allowed_chars):
+    # Every BMP character the rule allows: the disallowed runs are cut out of
+    # one string holding all 65536 code points (lone surrogates included).
+    bmp = array.array("I", range(0x10000)).tobytes().decode("utf-32-le", "surrogatepass")
+    return frozenset(re.sub(fr"[^{allowed_chars}]+", "", bmp))
+
+class CharPolicy:
+    """
+    The allowed-character rule, compiled once. The regex is kept for
+    substitutions, but classification uses lookup tables: a 128-byte
+    deletion table for the common all-ASCII cell (one bytes.translate pass
+    in C) and the set of allowed BMP characters for the rest, built on first
+    use by a single regex pass over all 65536 code points and shared by
+    every policy with the same rule. Characters outside the BMP are never
+    allowed.
+
+    Excel_Cleaner_V1 and SheetCleaner ship separately, so each carries this
+    class in its own char_policy.py; the two copies must stay identical
+    (SheetCleaner/tests/test_char_policy.py checks that they do).
+    """
+
+    def __init__(self, allowed_chars):
+        self.allowed_chars = allowed_chars
+        self.pattern = re.compile(fr"[^{allowed_chars}]")
+        self.allowed_ascii = bytes(cp for cp in range(0x80) if self.pattern.match(chr(cp)) is None)
+        self.ascii = frozenset(chr(cp) for cp in range(0x80))
+
+    @classmethod
+    def from_config(cls, config):
+        return cls("".join(config.get("allowed_chars_prefix", [])) + "".join(config.get("allowed_accents", [])))
+
+    @property
+    def allowed(self):
+        return allowed_bmp(self.allowed_chars)
+
+    def offending(self, text):
+        """
+        Returns (special, non_latin): the distinct disallowed and the distinct
+        non-ASCII characters of text, each sorted and joined into a string.
+        Both are empty for a clean cell.
+        """
+        if text.isascii():
+            found = text.encode("ascii").translate(None, self.allowed_ascii)
+            return ("".join(sorted(set(found.decode("ascii")))) if found else ""), ""
+        chars = set(text)
+        return "".join(sorted(chars - self.allowed)), "".join(sorted(chars - self.ascii))
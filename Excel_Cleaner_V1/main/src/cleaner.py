@@ -5,8 +5,17 @@ import argparse
 import concurrent.futures
 import datetime
 import threading
+import queue
+import numpy as np
 import pandas as pd
 from config_manager import load_config
+from char_policy import CharPolicy
+from cell_cache import CellCache
+from stream_reader import iter_sheet_chunks, iter_csv_chunks
+from report_sink import OrderedWriter, open_report_sink
+from columnar import COLUMNAR_FORMATS, ColumnarWriter, cleaned_sheet_path, write_frame
+from run_manifest import RunManifest, hash_config, hash_file
+from watch_daemon import Debouncer
 
 try:
     from ftfy import fix_text
@@ -27,19 +36,40 @@ config = load_config()
 INPUT_FOLDER = config.get("input_folder")
 OUTPUT_FOLDER = config.get("output_folder")
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-allowed_accents = "".join(config.get("allowed_accents", []))
-allowed_chars_prefix = "".join(config.get("allowed_chars_prefix", []))
-allowed_chars = allowed_chars_prefix + allowed_accents
+# "native" writes cleaned files in their input format; "parquet"/"arrow"
+# write one columnar file per sheet instead.
+OUTPUT_FORMAT = config.get("output_format", "native")
 replacement_mappings = config.get("replacement_mappings", {})
-special_char_pattern = re.compile(fr"[^{allowed_chars}]")
-non_latin_pattern = re.compile(r"[^\u0000-\u007F]")
+char_policy = CharPolicy.from_config(config)
+special_char_pattern = char_policy.pattern
+
+def compile_replacements(mappings):
+    # Folds replacement_mappings and the special-char strip into one regex
+    # whose alternatives are the multi-character keys (longest first), a
+    # class of the single-character keys, then a disallowed character, so
+    # one leftmost match picks whichever applies. Replacement values are
+    # stripped up front, so the result needs no further pass.
+    replacements = {k: special_char_pattern.sub('', v) for k, v in mappings.items() if k}
+    alternatives = [re.escape(k) for k in sorted((k for k in replacements if len(k) > 1), key=len, reverse=True)]
+    single = [k for k in replacements if len(k) == 1]
+    if single:
+        alternatives.append("[" + "".join(map(re.escape, single)) + "]")
+    alternatives.append(special_char_pattern.pattern)
+    pattern = re.compile("|".join(alternatives))
+    def replace(match):
+        return replacements.get(match.group(0), '')
+    return pattern, replace
+
+replacement_pattern, replacement_func = compile_replacements(replacement_mappings)
+parenthesized_name_pattern = re.compile(r'\([A-Za-z\s]+\)')
+# Superset of what the is_date formats can match (strptime's %d also accepts
+# a space-padded day); only cells matching it are handed to strptime.
+date_candidate_pattern = re.compile(r"[\d ]+/[\d ]+/[\d ]+")
+# Cleaned value per raw cell string, shared by every worker of a run.
+cell_cache = CellCache(config.get("cell_cache_size", 100000))
 
 def clean_text(text):
-    fixed = fix_broken_text(text)
-    for k, v in replacement_mappings.items():
-        fixed = fixed.replace(k, v)
-    cleaned = re.sub(special_char_pattern, '', fixed)
-    return cleaned
+    return replacement_pattern.sub(replacement_func, fix_broken_text(text))
 
 def is_date(text):
     date_formats = ["%d/%m/%Y", "%Y/%d/%m", "%Y/%m/%d", "%m/%d/%Y"]
@@ -52,11 +82,182 @@ def is_date(text):
     return False
 
 def contains_parenthesized_name(text):
-    return bool(re.search(r'\([A-Za-z\s]+\)', text))
+    return bool(parenthesized_name_pattern.search(text))
+
+def new_summary():
+    return {"total_cells": 0, "flagged": 0, "fixed": 0, "cache_hits": 0, "cache_misses": 0,
+            "errors": 0, "files_reused": 0}
+
+def find_emplid_column(df):
+    for col in df.columns:
+        if "EMPLID" in str(col).upper():
+            return col
+    return None
+
+def clean_values(raw_values):
+    # Vectorized clean_text over a batch of distinct raw strings; dates and
+    # parenthesized names are returned unchanged, as in the per-cell rules.
+    values = pd.Series(list(raw_values), dtype=object)
+    skip = values.str.contains(parenthesized_name_pattern, regex=True).to_numpy(dtype=bool, copy=True)
+    date_candidates = values.str.fullmatch(date_candidate_pattern).to_numpy() & ~skip
+    if date_candidates.any():
+        skip[date_candidates] = values[date_candidates].map(is_date).to_numpy(dtype=bool)
+    cleaned = values.copy()
+    to_clean = values[~skip]
+    if not to_clean.empty:
+        fixed = to_clean.map(fix_broken_text)
+        cleaned[~skip] = fixed.str.replace(replacement_pattern, replacement_func, regex=True)
+    return cleaned.tolist()
+
+def scan_frame(df, file_name, sheet_name, auto_fix, dry_run, summary):
+    # Column-at-a-time equivalent of walking df.iterrows(): each distinct value
+    # of a column is cleaned once (or read from cell_cache), mapped back onto
+    # the column, and the flagged cells are put back in row-major order so the
+    # Details rows match the old loop.
+    summary["total_cells"] += df.size
+    if df.empty:
+        return []
+    emplid_column = find_emplid_column(df)
+    emplid_values = df[emplid_column].to_numpy(dtype=object) if emplid_column is not None else None
+    row_labels = df.index.to_numpy()
+    flagged_cells = []
+    for col_idx, col in enumerate(df.columns):
+        column = df.iloc[:, col_idx]
+        positions = np.flatnonzero(column.notna().to_numpy())
+        if positions.size == 0:
+            continue
+        values = pd.Series(column.to_numpy(dtype=object)[positions], dtype=object).map(str)
+        counts = values.value_counts(sort=False)
+        resolved, hits, misses = cell_cache.get_many(counts.index.tolist(), clean_values, counts.to_numpy())
+        summary["cache_hits"] += hits
+        summary["cache_misses"] += misses
+        cleaned = values.map(resolved)
+        changed = (cleaned != values).to_numpy()
+        if not changed.any():
+            continue
+        originals = values[changed]
+        fixed_values = cleaned[changed]
+        flag_positions = positions[changed]
+        summary["flagged"] += len(flag_positions)
+        if auto_fix and not dry_run:
+            df.iloc[flag_positions, col_idx] = fixed_values.to_numpy()
+            summary["fixed"] += len(flag_positions)
+        offending = [char_policy.offending(cell_str) for cell_str in originals]
+        for pos, cell_str, cleaned_str, (special, non_latin) in zip(
+                flag_positions, originals, fixed_values, offending):
+            emplid_value = emplid_values[pos] if emplid_values is not None else "N/A"
+            flagged_cells.append((pos, col_idx, [file_name, sheet_name, emplid_value, row_labels[pos] + 1, col,
+                                                 cell_str, cleaned_str, special, non_latin]))
+    flagged_cells.sort(key=lambda cell: (cell[0], cell[1]))
+    return [row for _, _, row in flagged_cells]
+
+def read_sheet(xls, file_name, sheet_name):
+    try:
+        return pd.read_excel(xls, sheet_name=sheet_name, dtype=str)
+    except Exception as e:
+        print(f"{datetime.datetime.now()} - Error reading sheet {sheet_name} in {file_name}: {e}")
+        return None
+
+def save_cleaned_workbook(file_name, sheets):
+    if OUTPUT_FORMAT in COLUMNAR_FORMATS:
+        for sheet_name, df in sheets.items():
+            output_file = cleaned_sheet_path(OUTPUT_FOLDER, file_name, sheet_name, OUTPUT_FORMAT)
+            write_frame(output_file, OUTPUT_FORMAT, df)
+            print(f"{datetime.datetime.now()} - Cleaned file saved: {output_file}")
+        return
+    ext = os.path.splitext(file_name)[1].lower()
+    output_file = os.path.join(OUTPUT_FOLDER, os.path.splitext(file_name)[0] + "_cleaned" + ext)
+    with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
+        for sheet_name, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+    print(f"{datetime.datetime.now()} - Cleaned file saved: {output_file}")
 
-def process_file(file_path, auto_fix, dry_run):
+def frame_rows(df):
+    # Row lists for a write-only openpyxl sheet, with NaN written as blank.
+    return df.astype(object).where(df.notna(), None).values.tolist()
+
+def process_file_streaming(file_path, auto_fix, dry_run):
+    # Chunked variant of process_file: sheets are read stream_chunk_rows rows
+    # at a time and, with auto_fix, cleaned chunks are appended straight to
+    # the output file, so memory is bounded by the chunk size.
     results = []
-    summary = {"total_cells": 0, "flagged": 0, "fixed": 0}
+    summary = new_summary()
+    file_name = os.path.basename(file_path)
+    base, ext = os.path.splitext(file_name)
+    ext = ext.lower()
+    chunk_rows = max(int(config.get("stream_chunk_rows", 50000)), 1)
+    write = auto_fix and not dry_run
+    columnar = write and OUTPUT_FORMAT in COLUMNAR_FORMATS
+    if ext in [".xlsx", ".xls"]:
+        from openpyxl import Workbook
+        output_file = os.path.join(OUTPUT_FOLDER, base + "_cleaned" + ext)
+        wb = Workbook(write_only=True) if write and not columnar else None
+        try:
+            for sheet_name, chunks in iter_sheet_chunks(file_path, chunk_rows):
+                ws = None
+                writer = None
+                try:
+                    for df in chunks:
+                        results.extend(scan_frame(df, file_name, sheet_name, auto_fix, dry_run, summary))
+                        if columnar:
+                            if writer is None:
+                                writer = ColumnarWriter(cleaned_sheet_path(OUTPUT_FOLDER, file_name, sheet_name,
+                                                                           OUTPUT_FORMAT), OUTPUT_FORMAT)
+                            writer.write_frame(df)
+                        elif wb is not None:
+                            if ws is None:
+                                ws = wb.create_sheet(sheet_name)
+                                ws.append([str(col) for col in df.columns])
+                            for row in frame_rows(df):
+                                ws.append(row)
+                except Exception as e:
+                    print(f"{datetime.datetime.now()} - Error reading sheet {sheet_name} in {file_name}: {e}")
+                    summary["errors"] += 1
+                finally:
+                    if writer is not None:
+                        writer.close()
+                        print(f"{datetime.datetime.now()} - Cleaned file saved: {writer.path}")
+        except Exception as e:
+            print(f"{datetime.datetime.now()} - Error opening {file_name}: {e}")
+            summary["errors"] += 1
+            return (results, summary)
+        if wb is not None:
+            if wb.worksheets:
+                wb.save(output_file)
+                print(f"{datetime.datetime.now()} - Cleaned file saved: {output_file}")
+            wb.close()
+    elif ext == ".csv":
+        if columnar:
+            output_file = cleaned_sheet_path(OUTPUT_FOLDER, file_name, "Sheet1", OUTPUT_FORMAT)
+            writer = ColumnarWriter(output_file, OUTPUT_FORMAT)
+        else:
+            output_file = os.path.join(OUTPUT_FOLDER, base + "_cleaned.csv")
+            writer = None
+        try:
+            for i, df in enumerate(iter_csv_chunks(file_path, chunk_rows)):
+                results.extend(scan_frame(df, file_name, "Sheet1", auto_fix, dry_run, summary))
+                if writer is not None:
+                    writer.write_frame(df)
+                elif write:
+                    df.to_csv(output_file, index=False, mode="w" if i == 0 else "a", header=i == 0)
+        except Exception as e:
+            print(f"{datetime.datetime.now()} - Error reading CSV {file_name}: {e}")
+            summary["errors"] += 1
+            return (results, summary)
+        finally:
+            if writer is not None:
+                writer.close()
+        if write:
+            print(f"{datetime.datetime.now()} - Cleaned file saved: {output_file}")
+    else:
+        print(f"{datetime.datetime.now()} - Unsupported file type: {file_name}")
+    return (results, summary)
+
+def process_file(file_path, auto_fix, dry_run, stream=False):
+    if stream:
+        return process_file_streaming(file_path, auto_fix, dry_run)
+    results = []
+    summary = new_summary()
     file_name = os.path.basename(file_path)
     ext = os.path.splitext(file_name)[1].lower()
     if ext in [".xlsx", ".xls"]:
@@ -64,78 +265,31 @@ def process_file(file_path, auto_fix, dry_run):
             xls = pd.ExcelFile(file_path)
         except Exception as e:
             print(f"{datetime.datetime.now()} - Error opening {file_name}: {e}")
+            summary["errors"] += 1
             return (results, summary)
         sheets = {}
         for sheet_name in xls.sheet_names:
-            try:
-                df = pd.read_excel(xls, sheet_name=sheet_name, dtype=str)
-            except Exception as e:
-                print(f"{datetime.datetime.now()} - Error reading sheet {sheet_name} in {file_name}: {e}")
+            df = read_sheet(xls, file_name, sheet_name)
+            if df is None:
+                summary["errors"] += 1
                 continue
             if df.empty:
                 continue
-            emplid_column = None
-            for col in df.columns:
-                if "EMPLID" in str(col).upper():
-                    emplid_column = col
-                    break
-            for row_idx, row in df.iterrows():
-                emplid_value = row[emplid_column] if emplid_column in df.columns else "N/A"
-                for col_idx, cell_value in enumerate(row):
-                    summary["total_cells"] += 1
-                    if pd.notna(cell_value):
-                        cell_str = str(cell_value)
-                        if is_date(cell_str) or contains_parenthesized_name(cell_str):
-                            cleaned = cell_str
-                        else:
-                            cleaned = clean_text(cell_str)
-                        special_chars = ''.join(sorted(set(special_char_pattern.findall(cell_str))))
-                        non_latin_chars = ''.join(sorted(set(non_latin_pattern.findall(cell_str))))
-                        if cell_str != cleaned:
-                            summary["flagged"] += 1
-                            if auto_fix and not dry_run:
-                                df.iat[row_idx, col_idx] = cleaned
-                                summary["fixed"] += 1
-                            results.append([file_name, sheet_name, emplid_value, row_idx+1, df.columns[col_idx],
-                                            cell_str, cleaned, special_chars, non_latin_chars])
+            results.extend(scan_frame(df, file_name, sheet_name, auto_fix, dry_run, summary))
             sheets[sheet_name] = df
         if auto_fix and not dry_run:
-            output_file = os.path.join(OUTPUT_FOLDER, os.path.splitext(file_name)[0] + "_cleaned" + ext)
-            with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
-                for sheet_name, df in sheets.items():
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
-            print(f"{datetime.datetime.now()} - Cleaned file saved: {output_file}")
+            save_cleaned_workbook(file_name, sheets)
     elif ext == ".csv":
         try:
             df = pd.read_csv(file_path, dtype=str)
         except Exception as e:
             print(f"{datetime.datetime.now()} - Error reading CSV {file_name}: {e}")
+            summary["errors"] += 1
             return (results, summary)
-        emplid_column = None
-        for col in df.columns:
-            if "EMPLID" in str(col).upper():
-                emplid_column = col
-                break
-        for row_idx, row in df.iterrows():
-            emplid_value = row[emplid_column] if emplid_column in df.columns else "N/A"
-            for col_idx, cell_value in enumerate(row):
-                summary["total_cells"] += 1
-                if pd.notna(cell_value):
-                    cell_str = str(cell_value)
-                    if is_date(cell_str) or contains_parenthesized_name(cell_str):
-                        cleaned = cell_str
-                    else:
-                        cleaned = clean_text(cell_str)
-                    special_chars = ''.join(sorted(set(special_char_pattern.findall(cell_str))))
-                    non_latin_chars = ''.join(sorted(set(non_latin_pattern.findall(cell_str))))
-                    if cell_str != cleaned:
-                        summary["flagged"] += 1
-                        if auto_fix and not dry_run:
-                            df.iat[row_idx, col_idx] = cleaned
-                            summary["fixed"] += 1
-                        results.append([file_name, "Sheet1", emplid_value, row_idx+1, df.columns[col_idx],
-                                        cell_str, cleaned, special_chars, non_latin_chars])
-        if auto_fix and not dry_run:
+        results.extend(scan_frame(df, file_name, "Sheet1", auto_fix, dry_run, summary))
+        if auto_fix and not dry_run and OUTPUT_FORMAT in COLUMNAR_FORMATS:
+            save_cleaned_workbook(file_name, {"Sheet1": df})
+        elif auto_fix and not dry_run:
             output_file = os.path.join(OUTPUT_FOLDER, os.path.splitext(file_name)[0] + "_cleaned.csv")
             df.to_csv(output_file, index=False)
             print(f"{datetime.datetime.now()} - Cleaned file saved: {output_file}")
@@ -143,75 +297,307 @@ def process_file(file_path, auto_fix, dry_run):
         print(f"{datetime.datetime.now()} - Unsupported file type: {file_name}")
     return (results, summary)
 
-def process_all_files(auto_fix, dry_run):
-    all_results = []
-    total_summary = {"total_cells": 0, "flagged": 0, "fixed": 0}
-    files = [os.path.join(INPUT_FOLDER, f) for f in os.listdir(INPUT_FOLDER)
-             if os.path.splitext(f)[1].lower() in [".xlsx", ".xls", ".csv"]]
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        futures = {executor.submit(process_file, f, auto_fix, dry_run): f for f in files}
+def process_sheet(file_path, sheet_name, auto_fix, dry_run):
+    # Process-pool task for one sheet of a large workbook. The cleaned frame is
+    # sent back so the parent can write the whole workbook once every sheet
+    # has been scanned.
+    summary = new_summary()
+    file_name = os.path.basename(file_path)
+    df = read_sheet(file_path, file_name, sheet_name)
+    if df is None:
+        summary["errors"] += 1
+    if df is None or df.empty:
+        return ([], summary, None)
+    results = scan_frame(df, file_name, sheet_name, auto_fix, dry_run, summary)
+    return (results, summary, df if auto_fix and not dry_run else None)
+
+def list_input_files():
+    return [os.path.join(INPUT_FOLDER, f) for f in os.listdir(INPUT_FOLDER)
+            if os.path.splitext(f)[1].lower() in [".xlsx", ".xls", ".csv"]]
+
+def merge_summary(total_summary, summary):
+    for key, value in summary.items():
+        total_summary[key] = total_summary.get(key, 0) + value
+
+def reuse_unchanged_files(files, manifest, sink, total_summary, full=False):
+    # Replays the stored report rows of files whose content and cleaning config
+    # match the manifest, and returns (file, content_hash) pairs still to scan.
+    # Cache counters are not replayed since no lookups happened this run.
+    to_scan = []
+    for f in files:
+        try:
+            content_hash = manifest.content_hash(f)
+        except OSError as e:
+            print(f"{datetime.datetime.now()} - Error hashing {os.path.basename(f)}: {e}")
+            total_summary["errors"] += 1
+            continue
+        previous = None if full else manifest.lookup(f, content_hash)
+        if previous is None:
+            to_scan.append((f, content_hash))
+            continue
+        rows, summary = previous
+        manifest.touch(f)
+        sink.write(rows)
+        merge_summary(total_summary, {k: v for k, v in summary.items() if not k.startswith("cache_")})
+        total_summary["files_reused"] += 1
+    return to_scan
+
+def record_file(manifest, file_path, content_hash, rows, summary):
+    # Files that hit a read error are left out of the manifest so the next
+    # run scans them again.
+    manifest.add_rows(file_path, rows)
+    if summary["errors"] == 0:
+        manifest.complete(file_path, content_hash, summary)
+
+def list_split_sheets(file_path, stream=False):
+    # Sheet names of a workbook big enough to be fanned out sheet by sheet,
+    # or None when the file should be handled by a single process_file task.
+    # Streamed files are never split: the chunked reader already bounds memory.
+    if stream or os.path.splitext(file_path)[1].lower() not in [".xlsx", ".xls"]:
+        return None
+    if os.path.getsize(file_path) < config.get("sheet_split_mb", 50) * 1024 * 1024:
+        return None
+    try:
+        sheet_names = pd.ExcelFile(file_path).sheet_names
+    except Exception as e:
+        print(f"{datetime.datetime.now()} - Error opening {os.path.basename(file_path)}: {e}")
+        return None
+    return sheet_names if len(sheet_names) > 1 else None
+
+def process_all_files_in_processes(files, auto_fix, dry_run, sink, workers=None, stream=False, manifest=None):
+    # Each worker process imports this module once, so config, the compiled
+    # patterns and its own cell_cache are built per worker rather than per
+    # task; summaries (including cache counts) are merged back here.
+    # files holds (path, content_hash) pairs. Rows reach sink in file and
+    # sheet order, as in the serial run, whatever order the tasks finish in.
+    total_summary = new_summary()
+    pending_sheets = {}
+    writer = OrderedWriter(sink)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for f, content_hash in files:
+            sheet_names = list_split_sheets(f, stream)
+            if sheet_names is None:
+                task = (len(futures), f, content_hash, None)
+                futures[executor.submit(process_file, f, auto_fix, dry_run, stream)] = task
+                continue
+            pending_sheets[f] = {"order": sheet_names, "done": {}, "rows": {}, "summary": new_summary()}
+            for sheet_name in sheet_names:
+                task = (len(futures), f, content_hash, sheet_name)
+                futures[executor.submit(process_sheet, f, sheet_name, auto_fix, dry_run)] = task
         for future in concurrent.futures.as_completed(futures):
+            index, f, content_hash, sheet_name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"{datetime.datetime.now()} - Error processing {os.path.basename(f)}: {e}")
+                failed = new_summary()
+                failed["errors"] = 1
+                result = ([], failed, None) if sheet_name is not None else ([], failed)
+            writer.write(index, result[0])
+            merge_summary(total_summary, result[1])
+            if sheet_name is None:
+                if manifest is not None:
+                    record_file(manifest, f, content_hash, result[0], result[1])
+                continue
+            workbook = pending_sheets[f]
+            workbook["done"][sheet_name] = result[2]
+            workbook["rows"][sheet_name] = result[0]
+            merge_summary(workbook["summary"], result[1])
+            if len(workbook["done"]) == len(workbook["order"]):
+                if auto_fix and not dry_run:
+                    sheets = {name: workbook["done"][name] for name in workbook["order"]
+                              if workbook["done"][name] is not None}
+                    save_cleaned_workbook(os.path.basename(f), sheets)
+                if manifest is not None:
+                    rows = [row for name in workbook["order"] for row in workbook["rows"][name]]
+                    record_file(manifest, f, content_hash, rows, workbook["summary"])
+                del pending_sheets[f]
+    return total_summary
+
+def process_all_files(auto_fix, dry_run, sink, workers=None, executor_kind="thread", stream=False,
+                      manifest=None, full=False):
+    # Result rows go to sink as each file completes rather than being
+    # collected; only the merged summary is returned. With a manifest,
+    # unchanged files are replayed from it instead of being scanned.
+    files = list_input_files()
+    total_summary = new_summary()
+    if manifest is not None:
+        manifest.prune(files)
+        to_scan = reuse_unchanged_files(files, manifest, sink, total_summary, full)
+        for f, _ in to_scan:
+            manifest.begin(f)
+    else:
+        to_scan = [(f, None) for f in files]
+    if executor_kind == "process":
+        merge_summary(total_summary, process_all_files_in_processes(to_scan, auto_fix, dry_run, sink, workers,
+                                                                    stream, manifest))
+        return total_summary
+    writer = OrderedWriter(sink)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(process_file, f, auto_fix, dry_run, stream): (index, f, content_hash)
+                   for index, (f, content_hash) in enumerate(to_scan)}
+        for future in concurrent.futures.as_completed(futures):
+            index, f, content_hash = futures[future]
             res, summ = future.result()
-            all_results.extend(res)
-            total_summary["total_cells"] += summ["total_cells"]
-            total_summary["flagged"] += summ["flagged"]
-            total_summary["fixed"] += summ["fixed"]
-    return all_results, total_summary
+            writer.write(index, res)
+            merge_summary(total_summary, summ)
+            if manifest is not None:
+                record_file(manifest, f, content_hash, res, summ)
+    return total_summary
 
 def write_report(results, summary):
-    if results:
-        report_df = pd.DataFrame(results, columns=["File Name", "Sheet Name", "EMPLID", "Row", "Column",
-                                                    "Original Value", "Cleaned Value",
-                                                    "Special Characters", "Non-Latin Characters"])
-    else:
-        report_df = pd.DataFrame(columns=["File Name", "Sheet Name", "EMPLID", "Row", "Column",
-                                          "Original Value", "Cleaned Value",
-                                          "Special Characters", "Non-Latin Characters"])
-    summary_df = pd.DataFrame([summary])
-    output_report = os.path.join(OUTPUT_FOLDER, "output_report.xlsx")
-    with pd.ExcelWriter(output_report, engine="openpyxl") as writer:
-        report_df.to_excel(writer, sheet_name="Details", index=False)
-        summary_df.to_excel(writer, sheet_name="Summary", index=False)
-    print(f"{datetime.datetime.now()} - Report saved: {output_report}")
-
-def run_watcher(auto_fix, dry_run):
+    with open_report_sink(OUTPUT_FOLDER, config.get("report_format", "xlsx")) as sink:
+        sink.write(results)
+        sink.close(summary)
+
+def write_cumulative_report(manifest, report_format):
+    # Rebuilds the report from every file recorded in the manifest, so files
+    # picked up by the watcher add to the report instead of replacing it.
+    total_summary = new_summary()
+    with open_report_sink(OUTPUT_FOLDER, report_format) as sink:
+        for _, rows, summary in manifest.entries():
+            sink.write(rows)
+            merge_summary(total_summary, {k: v for k, v in summary.items() if not k.startswith("cache_")})
+        sink.close(total_summary)
+
+def is_watched_file(path):
+    name = os.path.basename(path)
+    # "~$" files are Excel's lock files for open workbooks.
+    return not name.startswith("~$") and os.path.splitext(name)[1].lower() in [".xlsx", ".xls", ".csv"]
+
+def run_watcher(auto_fix, dry_run, stream=False, workers=None, report_format="xlsx"):
+    # Watchdog events only touch the debouncer; settled paths go through a
+    # bounded queue to a pool of worker threads, and a single reporter thread
+    # owns the manifest and rewrites the cumulative report once the finished
+    # files it has received are recorded.
     if not WATCHDOG_AVAILABLE:
         print(f"{datetime.datetime.now()} - Watchdog not available.")
         return
     from watchdog.events import FileSystemEventHandler
     from watchdog.observers import Observer
+    stop_event = threading.Event()
+    work_queue = queue.Queue(maxsize=max(int(config.get("watch_queue_size", 100)), 1))
+    done_queue = queue.Queue()
+    debouncer = Debouncer(float(config.get("watch_debounce_seconds", 2.0)), work_queue, stop_event)
+
     class Handler(FileSystemEventHandler):
+        def touch(self, path):
+            if is_watched_file(path):
+                debouncer.touch(path)
+
         def on_created(self, event):
             if not event.is_directory:
-                ext = os.path.splitext(event.src_path)[1].lower()
-                if ext in [".xlsx", ".xls", ".csv"]:
-                    print(f"{datetime.datetime.now()} - Detected new file: {event.src_path}")
-                    res, summ = process_file(event.src_path, auto_fix, dry_run)
-                    if res:
-                        write_report(res, summ)
-    event_handler = Handler()
+                self.touch(event.src_path)
+
+        def on_modified(self, event):
+            if not event.is_directory:
+                self.touch(event.src_path)
+
+        def on_moved(self, event):
+            if not event.is_directory:
+                self.touch(event.dest_path)
+
+    def worker():
+        while True:
+            f = work_queue.get()
+            if f is None:
+                break
+            debouncer.started(f)
+            print(f"{datetime.datetime.now()} - Detected new file: {f}")
+            try:
+                content_hash = hash_file(f)
+                res, summ = process_file(f, auto_fix, dry_run, stream)
+            except Exception as e:
+                print(f"{datetime.datetime.now()} - Error processing {os.path.basename(f)}: {e}")
+                continue
+            done_queue.put((f, content_hash, res, summ))
+
+    def reporter():
+        manifest = RunManifest(os.path.join(OUTPUT_FOLDER, "run_manifest.sqlite"),
+                               hash_config(config, auto_fix, dry_run))
+        try:
+            finished = False
+            while not finished:
+                batch = [done_queue.get()]
+                while True:
+                    try:
+                        batch.append(done_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                recorded = False
+                for item in batch:
+                    if item is None:
+                        finished = True
+                        continue
+                    f, content_hash, res, summ = item
+                    manifest.begin(f)
+                    record_file(manifest, f, content_hash, res, summ)
+                    recorded = True
+                if recorded:
+                    write_cumulative_report(manifest, report_format)
+        finally:
+            manifest.close()
+
+    worker_count = workers or min(4, os.cpu_count() or 1)
+    worker_threads = [threading.Thread(target=worker, daemon=True) for _ in range(worker_count)]
+    reporter_thread = threading.Thread(target=reporter, daemon=True)
+    debouncer.start()
+    for t in worker_threads:
+        t.start()
+    reporter_thread.start()
     observer = Observer()
-    observer.schedule(event_handler, INPUT_FOLDER, recursive=False)
+    observer.schedule(Handler(), INPUT_FOLDER, recursive=False)
     observer.start()
+    print(f"{datetime.datetime.now()} - Watching {INPUT_FOLDER}")
     try:
-        while True:
-            pass
+        # join with a timeout blocks without spinning and still lets
+        # KeyboardInterrupt through on Windows.
+        while observer.is_alive():
+            observer.join(1.0)
     except KeyboardInterrupt:
+        pass
+    finally:
         observer.stop()
-    observer.join()
+        observer.join()
+        stop_event.set()
+        debouncer.join()
+        for _ in worker_threads:
+            work_queue.put(None)
+        for t in worker_threads:
+            t.join()
+        done_queue.put(None)
+        reporter_thread.join()
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--auto_fix", action="store_true")
     parser.add_argument("--dry_run", action="store_true")
     parser.add_argument("--watch", action="store_true")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--full", action="store_true")
+    parser.add_argument("--report_format", choices=["xlsx", "csv", "parquet", "arrow"], default=config.get("report_format", "xlsx"))
     args = parser.parse_args()
     if args.watch:
-        run_watcher(args.auto_fix, args.dry_run)
+        run_watcher(args.auto_fix, args.dry_run, args.stream, args.workers, args.report_format)
     else:
-        results, summary = process_all_files(args.auto_fix, args.dry_run)
-        write_report(results, summary)
-        print(f"{datetime.datetime.now()} - Total cells processed: {summary['total_cells']}, Flagged: {summary['flagged']}, Fixed: {summary['fixed']}")
+        manifest = None
+        if config.get("incremental", True):
+            manifest = RunManifest(os.path.join(OUTPUT_FOLDER, "run_manifest.sqlite"),
+                                   hash_config(config, args.auto_fix, args.dry_run))
+        try:
+            with open_report_sink(OUTPUT_FOLDER, args.report_format) as sink:
+                summary = process_all_files(args.auto_fix, args.dry_run, sink, args.workers, args.executor,
+                                            args.stream, manifest, args.full)
+                sink.close(summary)
+        finally:
+            if manifest is not None:
+                manifest.close()
+        print(f"{datetime.datetime.now()} - Total cells processed: {summary['total_cells']}, Flagged: {summary['flagged']}, Fixed: {summary['fixed']}, "
+              f"Cache hits: {summary['cache_hits']}, Cache misses: {summary['cache_misses']}, "
+              f"Reused files: {summary['files_reused']}, Errors: {summary['errors']}")
 
 if __name__ == "__main__":
     sys.stdout.reconfigure(encoding='utf-8')
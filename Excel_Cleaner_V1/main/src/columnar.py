@@ -0,0 +1,70 @@
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# output_format / report_format values handled here, with their extensions.
+COLUMNAR_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+def require_pyarrow(fmt):
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError(f"pyarrow is required for {fmt} output (pip install pyarrow)")
+
+def cleaned_sheet_path(output_folder, file_name, sheet_name, fmt):
+    # Columnar files hold one table, so a cleaned workbook becomes a folder
+    # with one file per sheet: output/<name>_cleaned/<sheet>.parquet
+    folder = os.path.join(output_folder, os.path.splitext(file_name)[0] + "_cleaned")
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, str(sheet_name) + COLUMNAR_FORMATS[fmt])
+
+class ColumnarWriter:
+    """Appends record batches to a Parquet or Arrow IPC file.
+
+    The file is opened on the first batch, using that batch's schema. Arrow
+    files are written in the IPC file format so readers can memory-map them.
+    """
+
+    def __init__(self, path, fmt, schema=None):
+        require_pyarrow(fmt)
+        self.path = path
+        self.fmt = fmt
+        self.schema = schema
+        self._writer = None
+
+    def write_table(self, table):
+        if self._writer is None:
+            if self.schema is None:
+                self.schema = table.schema
+            if self.fmt == "parquet":
+                self._writer = pq.ParquetWriter(self.path, self.schema)
+            else:
+                self._writer = pa.ipc.new_file(self.path, self.schema)
+        self._writer.write_table(table.cast(self.schema))
+
+    def write_frame(self, df):
+        # Cleaned sheets are read with dtype=str, so every column is stored as
+        # a string column (nulls stay null).
+        columns = [str(col) for col in df.columns]
+        frame = df.astype(object).set_axis(columns, axis=1)
+        self.write_table(pa.Table.from_pandas(frame, preserve_index=False,
+                                              schema=pa.schema([(col, pa.string()) for col in columns])))
+
+    def write_rows(self, rows, columns):
+        self.write_table(pa.Table.from_pylist([dict(zip(columns, row)) for row in rows], schema=self.schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+def write_frame(path, fmt, df):
+    writer = ColumnarWriter(path, fmt)
+    try:
+        writer.write_frame(df)
+    finally:
+        writer.close()
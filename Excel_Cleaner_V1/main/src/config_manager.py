@@ -10,6 +10,14 @@ def load_config():
         "allowed_accents": list("àáâãäåæçèéêëìíîïðñòóôõöøùúûüýþÿÀÁÂÃÄÅÆÇÈÉÊËÌÍÎÏÐÑÒÓÔÕÖØÙÚÛÜÝÞß.\\-'"),
         "allowed_chars_prefix": ["a-zA-Z0-9", "\\s"],
         "replacement_mappings": {"â": "a", "à": "a", "ä": "a", "é": "e", "è": "e", "ë": "e", "ç": "c"},
+        "cell_cache_size": 100000,
+        "sheet_split_mb": 50,
+        "stream_chunk_rows": 50000,
+        "report_format": "xlsx",
+        "output_format": "native",
+        "incremental": True,
+        "watch_debounce_seconds": 2.0,
+        "watch_queue_size": 100,
         "input_folder": os.path.join(BASE_DIR, "..", "input"),
         "output_folder": os.path.join(BASE_DIR, "..", "output")
     }
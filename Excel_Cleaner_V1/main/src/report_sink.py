@@ -0,0 +1,187 @@
+import os
+import csv
+import math
+import datetime
+from columnar import COLUMNAR_FORMATS, ColumnarWriter, require_pyarrow
+
+REPORT_COLUMNS = ["File Name", "Sheet Name", "EMPLID", "Row", "Column",
+                  "Original Value", "Cleaned Value",
+                  "Special Characters", "Non-Latin Characters"]
+
+def blank_nan(value):
+    # Missing EMPLIDs come through as float NaN; write them as empty cells.
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+class ReportSink:
+    """Incremental writer for the Details rows of a run.
+
+    Batches of result rows are passed to write() as each file finishes and
+    go straight to disk; close() adds the Summary once the run is over, so
+    the full result list is never held in memory.
+    """
+
+    def __init__(self, output_folder):
+        self.output_folder = output_folder
+        self.rows_written = 0
+
+    def write(self, rows):
+        for row in rows:
+            self.write_row([blank_nan(v) for v in row])
+            self.rows_written += 1
+
+    def write_row(self, row):
+        raise NotImplementedError
+
+    def close(self, summary):
+        raise NotImplementedError
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Only abandon the output on error; a normal close needs the summary.
+        if exc_type is not None:
+            self.abort()
+        return False
+
+    def abort(self):
+        pass
+
+class OrderedWriter:
+    """Writes the rows of concurrent tasks to a sink in submission order.
+
+    write(index, rows) is called once per task, numbered from 0 in the order
+    the tasks were submitted. Rows of a task that finishes early are held
+    until every task before it has been written, so the report matches the
+    serial run whatever the completion order.
+    """
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.pending = {}
+        self.next_index = 0
+
+    def write(self, index, rows):
+        self.pending[index] = rows
+        while self.next_index in self.pending:
+            self.sink.write(self.pending.pop(self.next_index))
+            self.next_index += 1
+
+class XlsxReportSink(ReportSink):
+    # openpyxl write-only mode streams rows to a temporary file on disk
+    # instead of keeping a cell object per value. It does not enforce
+    # Excel's row limit, so Details rolls over to Details_2, Details_3, ...
+    # once a sheet is full.
+    max_sheet_rows = 1048575
+
+    def __init__(self, output_folder):
+        super().__init__(output_folder)
+        from openpyxl import Workbook
+        self.path = os.path.join(output_folder, "output_report.xlsx")
+        self.workbook = Workbook(write_only=True)
+        self.details_sheets = 0
+        self.new_details_sheet()
+
+    def new_details_sheet(self):
+        self.details_sheets += 1
+        name = "Details" if self.details_sheets == 1 else f"Details_{self.details_sheets}"
+        self.details = self.workbook.create_sheet(name)
+        self.details.append(REPORT_COLUMNS)
+        self.details_rows = 0
+
+    def write_row(self, row):
+        if self.details_rows >= self.max_sheet_rows:
+            self.new_details_sheet()
+        self.details.append(row)
+        self.details_rows += 1
+
+    def close(self, summary):
+        summary_sheet = self.workbook.create_sheet("Summary")
+        summary_sheet.append(list(summary.keys()))
+        summary_sheet.append(list(summary.values()))
+        self.workbook.save(self.path)
+        self.workbook.close()
+        print(f"{datetime.datetime.now()} - Report saved: {self.path}")
+
+    def abort(self):
+        self.workbook.close()
+
+class CsvReportSink(ReportSink):
+    # Details go to output_report.csv; the Summary row to output_report_summary.csv.
+    def __init__(self, output_folder):
+        super().__init__(output_folder)
+        self.path = os.path.join(output_folder, "output_report.csv")
+        self.summary_path = os.path.join(output_folder, "output_report_summary.csv")
+        self.file = open(self.path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(REPORT_COLUMNS)
+
+    def write_row(self, row):
+        self.writer.writerow(row)
+
+    def close(self, summary):
+        self.file.close()
+        with open(self.summary_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(list(summary.keys()))
+            writer.writerow(list(summary.values()))
+        print(f"{datetime.datetime.now()} - Report saved: {self.path}")
+
+    def abort(self):
+        self.file.close()
+
+class ColumnarReportSink(ReportSink):
+    # Parquet or Arrow IPC report: rows are buffered and written as record
+    # batches of batch_rows; the Summary goes to output_report_summary.<ext>.
+    batch_rows = 50000
+
+    def __init__(self, output_folder, fmt):
+        super().__init__(output_folder)
+        require_pyarrow(fmt)
+        import pyarrow as pa
+        ext = COLUMNAR_FORMATS[fmt]
+        self.fmt = fmt
+        self.path = os.path.join(output_folder, "output_report" + ext)
+        self.summary_path = os.path.join(output_folder, "output_report_summary" + ext)
+        schema = pa.schema([(col, pa.int64() if col == "Row" else pa.string()) for col in REPORT_COLUMNS])
+        self.writer = ColumnarWriter(self.path, fmt, schema)
+        self.buffer = []
+
+    def write_row(self, row):
+        self.buffer.append([int(v) if col == "Row" else (None if v is None else str(v))
+                            for col, v in zip(REPORT_COLUMNS, row)])
+        if len(self.buffer) >= self.batch_rows:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.writer.write_rows(self.buffer, REPORT_COLUMNS)
+            self.buffer = []
+
+    def close(self, summary):
+        self.flush()
+        if self.rows_written == 0:
+            # No flagged cells: still leave an empty Details file behind.
+            self.writer.write_rows([], REPORT_COLUMNS)
+        self.writer.close()
+        summary_writer = ColumnarWriter(self.summary_path, self.fmt)
+        try:
+            summary_writer.write_rows([list(summary.values())], list(summary.keys()))
+        finally:
+            summary_writer.close()
+        print(f"{datetime.datetime.now()} - Report saved: {self.path}")
+
+    def abort(self):
+        self.writer.close()
+
+REPORT_SINKS = {
+    "xlsx": XlsxReportSink,
+    "csv": CsvReportSink,
+    "parquet": lambda output_folder: ColumnarReportSink(output_folder, "parquet"),
+    "arrow": lambda output_folder: ColumnarReportSink(output_folder, "arrow"),
+}
+
+def open_report_sink(output_folder, report_format="xlsx"):
+    if report_format not in REPORT_SINKS:
+        raise ValueError(f"Unknown report format: {report_format}")
+    return REPORT_SINKS[report_format](output_folder)
@@ -0,0 +1,123 @@
+import os
+import json
+import sqlite3
+import hashlib
+
+# Config keys that change what a scan produces; paths and tuning knobs are
+# left out so moving the folders or resizing the cache keeps the manifest.
+CLEANING_CONFIG_KEYS = ["allowed_accents", "allowed_chars_prefix", "replacement_mappings"]
+
+def hash_file(file_path, block_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hash_config(config, auto_fix, dry_run):
+    # The write mode is part of the key: a dry run leaves no cleaned file
+    # behind, so it cannot stand in for a later auto-fix run.
+    settings = {key: config.get(key) for key in CLEANING_CONFIG_KEYS}
+    settings["write_cleaned"] = bool(auto_fix and not dry_run)
+    settings["output_format"] = config.get("output_format", "native")
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def json_value(value):
+    # NumPy scalars (row numbers, EMPLIDs) are stored as plain Python values.
+    return value.item() if hasattr(value, "item") else str(value)
+
+class RunManifest:
+    """SQLite record of each scanned input file and the report rows it produced.
+
+    A file is reused when its content hash and the config hash match the last
+    completed scan. size and mtime are stored too, so unchanged files are not
+    re-read just to be hashed. The sqlite connection belongs to the thread that
+    created the instance, so only that thread may use it.
+    """
+
+    def __init__(self, path, config_hash):
+        self.path = path
+        self.config_hash = config_hash
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER,
+                mtime_ns INTEGER,
+                content_hash TEXT,
+                config_hash TEXT,
+                summary TEXT
+            );
+            CREATE TABLE IF NOT EXISTS rows (
+                path TEXT,
+                row TEXT
+            );
+            CREATE INDEX IF NOT EXISTS rows_path ON rows (path);
+        """)
+
+    def content_hash(self, file_path):
+        stat = os.stat(file_path)
+        entry = self.conn.execute("SELECT size, mtime_ns, content_hash FROM files WHERE path = ?",
+                                  (file_path,)).fetchone()
+        if entry is not None and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+        return hash_file(file_path)
+
+    def lookup(self, file_path, content_hash):
+        # (rows, summary) from the previous scan, or None if the file must be scanned.
+        entry = self.conn.execute("SELECT summary FROM files WHERE path = ? AND content_hash = ? AND config_hash = ?",
+                                  (file_path, content_hash, self.config_hash)).fetchone()
+        if entry is None:
+            return None
+        rows = [json.loads(row) for (row,) in
+                self.conn.execute("SELECT row FROM rows WHERE path = ? ORDER BY rowid", (file_path,))]
+        return rows, json.loads(entry[0])
+
+    def begin(self, file_path):
+        # Drop whatever was recorded for the file before its rows come back.
+        with self.conn:
+            self.conn.execute("DELETE FROM files WHERE path = ?", (file_path,))
+            self.conn.execute("DELETE FROM rows WHERE path = ?", (file_path,))
+
+    def add_rows(self, file_path, rows):
+        with self.conn:
+            self.conn.executemany("INSERT INTO rows (path, row) VALUES (?, ?)",
+                                  [(file_path, json.dumps(row, default=json_value, ensure_ascii=False))
+                                   for row in rows])
+
+    def complete(self, file_path, content_hash, summary):
+        stat = os.stat(file_path)
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                              (file_path, stat.st_size, stat.st_mtime_ns, content_hash, self.config_hash,
+                               json.dumps(summary, default=json_value)))
+
+    def touch(self, file_path):
+        # A reused file whose mtime changed but whose content did not: store
+        # its new size/mtime so the next run can skip hashing it again.
+        stat = os.stat(file_path)
+        with self.conn:
+            self.conn.execute("UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?",
+                              (stat.st_size, stat.st_mtime_ns, file_path))
+
+    def entries(self):
+        # (path, rows, summary) for every completed file under the current config.
+        files = self.conn.execute("SELECT path, summary FROM files WHERE config_hash = ? ORDER BY path",
+                                  (self.config_hash,)).fetchall()
+        for path, summary in files:
+            rows = [json.loads(row) for (row,) in
+                    self.conn.execute("SELECT row FROM rows WHERE path = ? ORDER BY rowid", (path,))]
+            yield path, rows, json.loads(summary)
+
+    def prune(self, file_paths):
+        # Forget files that are no longer in the input folder.
+        keep = set(file_paths)
+        stale = [path for (path,) in self.conn.execute("SELECT DISTINCT path FROM rows UNION SELECT path FROM files")
+                 if path not in keep]
+        with self.conn:
+            for path in stale:
+                self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                self.conn.execute("DELETE FROM rows WHERE path = ?", (path,))
+
+    def close(self):
+        self.conn.close()
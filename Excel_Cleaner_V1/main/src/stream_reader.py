@@ -0,0 +1,77 @@
+import os
+import pandas as pd
+from openpyxl import load_workbook
+
+# Formats openpyxl can open in read-only mode; anything else falls back to
+# pandas and is only sliced into chunks after being read whole.
+READ_ONLY_EXTENSIONS = (".xlsx", ".xlsm")
+
+def header_names(row):
+    # Mirrors pandas' header handling: blank headers become "Unnamed: i" and
+    # repeated names get ".1", ".2", ... suffixes.
+    names = []
+    seen = {}
+    for i, value in enumerate(row):
+        name = f"Unnamed: {i}" if value is None else str(value)
+        base = name
+        while name in seen:
+            seen[base] += 1
+            name = f"{base}.{seen[base]}"
+        seen[name] = 0
+        names.append(name)
+    return names
+
+def rows_to_frame(rows, columns, start):
+    # Cells are turned into strings like read_excel(dtype=str); the index
+    # continues from the previous chunk so row numbers stay sheet-relative.
+    width = len(columns)
+    data = [[None if v is None else str(v) for v in row[:width]] + [None] * (width - len(row))
+            for row in rows]
+    return pd.DataFrame(data, columns=columns, index=pd.RangeIndex(start, start + len(data)), dtype=object)
+
+def iter_worksheet_chunks(ws, chunk_rows):
+    rows = ws.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return
+    columns = header_names(header)
+    batch = []
+    start = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= chunk_rows:
+            yield rows_to_frame(batch, columns, start)
+            start += len(batch)
+            batch = []
+    if batch:
+        yield rows_to_frame(batch, columns, start)
+
+def iter_frame_chunks(df, chunk_rows):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].copy()
+
+def iter_sheet_chunks(file_path, chunk_rows):
+    """Yield (sheet_name, chunks) for every sheet of a workbook.
+
+    chunks is an iterator of DataFrames of at most chunk_rows rows. For
+    .xlsx/.xlsm the sheet is walked with openpyxl in read-only mode, so only
+    one chunk is held in memory at a time; other formats are read whole by
+    pandas first. Each chunks iterator must be consumed (or abandoned)
+    before moving to the next sheet.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in READ_ONLY_EXTENSIONS:
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for ws in wb.worksheets:
+                yield ws.title, iter_worksheet_chunks(ws, chunk_rows)
+        finally:
+            wb.close()
+    else:
+        xls = pd.ExcelFile(file_path)
+        for sheet_name in xls.sheet_names:
+            df = pd.read_excel(xls, sheet_name=sheet_name, dtype=str)
+            yield sheet_name, iter_frame_chunks(df, chunk_rows)
+
+def iter_csv_chunks(file_path, chunk_rows, sep=","):
+    return pd.read_csv(file_path, dtype=str, sep=sep, chunksize=chunk_rows)
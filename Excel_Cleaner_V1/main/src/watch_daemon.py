@@ -0,0 +1,77 @@
+import os
+import time
+import queue
+import threading
+
+class Debouncer(threading.Thread):
+    """Turns bursts of file-system events into one queued path per file.
+
+    touch() is called from the watchdog thread for every created, modified or
+    moved file. A path is put on out_queue only once it has had no events for
+    delay seconds and its size has stopped changing, so files still being
+    copied in are not picked up half-written. A path already waiting in the
+    queue is not queued twice; workers call started() when they take one, so
+    edits made while it is being processed queue it again.
+    """
+
+    def __init__(self, delay, out_queue, stop_event):
+        super().__init__(daemon=True)
+        self.delay = delay
+        self.out_queue = out_queue
+        self.stop_event = stop_event
+        self._pending = {}
+        self._queued = set()
+        self._cond = threading.Condition()
+
+    def touch(self, path):
+        with self._cond:
+            self._pending[path] = (time.monotonic(), file_size(path))
+            self._cond.notify()
+
+    def started(self, path):
+        with self._cond:
+            self._queued.discard(path)
+
+    def run(self):
+        while not self.stop_event.is_set():
+            with self._cond:
+                if not self._pending:
+                    self._cond.wait(1.0)
+                    continue
+                now = time.monotonic()
+                ready = []
+                next_due = None
+                for path, (last_event, size) in list(self._pending.items()):
+                    due = last_event + self.delay
+                    if due > now:
+                        next_due = due if next_due is None else min(next_due, due)
+                        continue
+                    current = file_size(path)
+                    if current is None:
+                        del self._pending[path]
+                    elif current != size:
+                        self._pending[path] = (now, current)
+                        next_due = now + self.delay if next_due is None else min(next_due, now + self.delay)
+                    else:
+                        del self._pending[path]
+                        if path not in self._queued:
+                            self._queued.add(path)
+                            ready.append(path)
+                if not ready:
+                    self._cond.wait(max(next_due - now, 0.05) if next_due is not None else 1.0)
+                    continue
+            # Queue outside the lock: a full queue blocks here (back-pressure)
+            # without holding up touch() on the watchdog thread.
+            for path in ready:
+                while not self.stop_event.is_set():
+                    try:
+                        self.out_queue.put(path, timeout=1.0)
+                        break
+                    except queue.Full:
+                        continue
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
@@ -0,0 +1,62 @@
+import math
+import numpy as np
+from PIL import Image
+
+def unique_edges(regions):
+    """
+    Vertex-index pairs of every polygon edge, sorted within each pair so an
+    edge shared by two neighbouring regions is kept once.
+    """
+    pairs = [(region[j], region[(j + 1) % len(region)])
+             for region in regions if len(region) > 2
+             for j in range(len(region))]
+    if not pairs:
+        return np.empty((0, 2), dtype=np.intp)
+    return np.unique(np.sort(np.array(pairs, dtype=np.intp), axis=1), axis=0)
+
+def dot_centers(vertices, edges, gap):
+    # All dots of all edges at once: edge k gets steps_k + 1 evenly spaced
+    # dots (both ends included), steps_k = max(int(length / gap), 1).
+    starts = vertices[edges[:, 0]]
+    deltas = vertices[edges[:, 1]] - starts
+    steps = np.maximum((np.hypot(deltas[:, 0], deltas[:, 1]) / gap).astype(np.intp), 1)
+    counts = steps + 1
+    edge_index = np.repeat(np.arange(len(edges)), counts)
+    position = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    t = position / steps[edge_index]
+    return starts[edge_index] + t[:, None] * deltas[edge_index]
+
+def dot_sprite(dot_radius):
+    # (dy, dx) pixel offsets of one filled dot, close to what
+    # ImageDraw.ellipse fills for a (2r+1)-pixel bounding box.
+    r = int(math.ceil(dot_radius))
+    dy, dx = np.mgrid[-r:r + 1, -r:r + 1]
+    mask = dx * dx + dy * dy <= dot_radius * dot_radius + dot_radius / 2
+    return dy[mask], dx[mask]
+
+def stamp_dots(canvas, centers, sprite, value=0):
+    # One fancy-indexing write per sprite pixel instead of one draw call per
+    # dot; dots falling off the canvas are clipped. Centers are floored,
+    # as ImageDraw does with fractional coordinates.
+    height, width = canvas.shape
+    cx = np.floor(centers[:, 0]).astype(np.intp)
+    cy = np.floor(centers[:, 1]).astype(np.intp)
+    r = int(np.abs(sprite[0]).max()) if len(sprite[0]) else 0
+    near = (cx >= -r) & (cx < width + r) & (cy >= -r) & (cy < height + r)
+    cx, cy = cx[near], cy[near]
+    for oy, ox in zip(*sprite):
+        ys = cy + oy
+        xs = cx + ox
+        inside = (ys >= 0) & (ys < height) & (xs >= 0) & (xs < width)
+        canvas[ys[inside], xs[inside]] = value
+
+def render_edges(vertices, edges, size, dot_radius, gap):
+    """
+    Renders edges (vertex-index pairs from unique_edges) as dotted lines,
+    black on white, into a grayscale image of size (width, height).
+    """
+    width, height = size
+    canvas = np.full((height, width), 255, dtype=np.uint8)
+    if len(edges):
+        stamp_dots(canvas, dot_centers(np.asarray(vertices, dtype=float), edges, gap), dot_sprite(dot_radius))
+    return Image.fromarray(canvas, "L")
@@ -6,6 +6,92 @@ from PIL import ImageTk
 import tkinter as tk
 from tkinter import messagebox
 import threading
+import random
+import queue
+import concurrent.futures
+from collections import OrderedDict
+
+# Slider events arriving within this many ms are coalesced into one render.
+PREVIEW_DEBOUNCE_MS = 80
+PREVIEW_CACHE_SIZE = 64
+
+class PreviewPipeline:
+    """
+    Renders previews off the Tk thread. Requests are coalesced for
+    PREVIEW_DEBOUNCE_MS and rendered one at a time on a background thread; a
+    request that has been superseded by the time its turn comes is skipped,
+    and only the newest result is passed to on_ready (on the Tk thread).
+    Rendered previews are kept per (complexity, dimension, seed), so moving
+    back to a setting already seen shows it immediately.
+    """
+
+    def __init__(self, root, on_ready):
+        self.root = root
+        self.on_ready = on_ready
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.results = queue.Queue()
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.latest = 0
+        self.pending = 0
+        self.timer = None
+
+    def cached(self, key):
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return self.cache[key]
+        return None
+
+    def request(self, key):
+        self.latest += 1
+        generation = self.latest
+        if self.timer is not None:
+            self.root.after_cancel(self.timer)
+            self.timer = None
+        img = self.cached(key)
+        if img is not None:
+            self.on_ready(img)
+            return
+        self.timer = self.root.after(PREVIEW_DEBOUNCE_MS, lambda: self.submit(generation, key))
+
+    def submit(self, generation, key):
+        self.timer = None
+        self.pending += 1
+        self.executor.submit(self.render, generation, key)
+        if self.pending == 1:
+            self.root.after(30, self.poll)
+
+    def render(self, generation, key):
+        # Background thread; every submission posts exactly one result.
+        img = None
+        if generation == self.latest:
+            try:
+                complexity, dimension, seed = key
+                img = generate_preview(complexity=complexity, dimension=dimension, seed=seed)
+                img.load()
+                with self.lock:
+                    self.cache[key] = img
+                    if len(self.cache) > PREVIEW_CACHE_SIZE:
+                        self.cache.popitem(last=False)
+            except Exception:
+                img = None
+        self.results.put((generation, img))
+
+    def poll(self):
+        while True:
+            try:
+                generation, img = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            if img is not None and generation == self.latest:
+                self.on_ready(img)
+        if self.pending:
+            self.root.after(30, self.poll)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
 
 def launch_interface():
     root = ttk.Window(themename="minty")
@@ -17,14 +103,23 @@ def launch_interface():
     num_var = tk.IntVar(value=50)
     output_dir = tk.StringVar(value="shapes")
     dimension = tk.StringVar(value="2D")
+    output_format = tk.StringVar(value="png")
     progress_var = tk.DoubleVar(value=0)
-    def update_preview(*args):
-        comp = complexity_var.get()
-        dim = dimension.get()
-        img = generate_preview(complexity=comp, dimension=dim)
+    seed_var = tk.IntVar(value=random.randrange(2 ** 31))
+    def show_preview(img):
         photo = ImageTk.PhotoImage(img)
         preview_label.config(image=photo)
         preview_label.image = photo
+    preview_pipeline = PreviewPipeline(root, show_preview)
+    def update_preview(*args):
+        try:
+            seed = seed_var.get()
+        except tk.TclError:
+            return
+        preview_pipeline.request((int(complexity_var.get()), dimension.get(), seed))
+    def new_seed():
+        seed_var.set(random.randrange(2 ** 31))
+        update_preview()
     def toggle_theme():
         if theme_var.get():
             root.style.theme_use("darkly")
@@ -43,7 +138,7 @@ def launch_interface():
     def generate():
         gen_btn.config(state="disabled")
         try:
-            generate_shapes(complexity=complexity_var.get(), num_shapes=num_var.get(), output_dir=output_dir.get(), dimension=dimension.get(), progress_callback=progress_callback)
+            generate_shapes(complexity=complexity_var.get(), num_shapes=num_var.get(), output_dir=output_dir.get(), dimension=dimension.get(), progress_callback=progress_callback, seed=seed_var.get(), output_format=output_format.get())
             status_label.config(text="Generation complete.")
         except Exception as e:
             status_label.config(text=f"Error: {str(e)}")
@@ -78,16 +173,27 @@ def launch_interface():
     ttk.Label(controls_frame, text="Output Folder:").grid(row=2, column=0, sticky="w")
     output_entry = ttk.Entry(controls_frame, textvariable=output_dir)
     output_entry.grid(row=2, column=1, sticky="ew", padx=5)
+    ttk.Label(controls_frame, text="Seed:").grid(row=3, column=0, sticky="w")
+    seed_frame = ttk.Frame(controls_frame)
+    seed_frame.grid(row=3, column=1, sticky="ew", padx=5)
+    seed_entry = ttk.Entry(seed_frame, textvariable=seed_var)
+    seed_entry.pack(side="left", fill="x", expand=True)
+    seed_entry.bind("<Return>", update_preview)
+    ttk.Button(seed_frame, text="New Seed", bootstyle=INFO, command=new_seed).pack(side="left", padx=5)
     dim_frame = ttk.Frame(controls_frame)
-    dim_frame.grid(row=3, column=0, columnspan=2, sticky="w", pady=5)
+    dim_frame.grid(row=4, column=0, columnspan=2, sticky="w", pady=5)
     ttk.Label(dim_frame, text="Dimension:").pack(side="left")
     ttk.Radiobutton(dim_frame, text="2D", variable=dimension, value="2D", command=update_preview).pack(side="left", padx=5)
     ttk.Radiobutton(dim_frame, text="3D", variable=dimension, value="3D", command=update_preview).pack(side="left", padx=5)
+    ttk.Label(dim_frame, text="Format:").pack(side="left", padx=(15, 0))
+    for fmt in ("png", "svg", "pdf"):
+        ttk.Radiobutton(dim_frame, text=fmt.upper(), variable=output_format, value=fmt).pack(side="left", padx=5)
     progress_bar = ttk.Progressbar(controls_frame, variable=progress_var, maximum=100)
-    progress_bar.grid(row=4, column=0, columnspan=2, sticky="ew", pady=5)
+    progress_bar.grid(row=5, column=0, columnspan=2, sticky="ew", pady=5)
     status_label = ttk.Label(controls_frame, text="")
-    status_label.grid(row=5, column=0, columnspan=2, sticky="w")
+    status_label.grid(row=6, column=0, columnspan=2, sticky="w")
     gen_btn = ttk.Button(controls_frame, text="Generate Patterns", bootstyle=SUCCESS, command=start_generation)
-    gen_btn.grid(row=6, column=0, columnspan=2, sticky="ew", pady=10)
+    gen_btn.grid(row=7, column=0, columnspan=2, sticky="ew", pady=10)
     update_preview()
     root.mainloop()
+    preview_pipeline.shutdown()
@@ -0,0 +1,99 @@
+import os
+import io
+import hashlib
+import tempfile
+import numpy as np
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shape_cache")
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+# evict() also runs after every EVICT_EVERY writes of a ShapeCache, so the
+# size bound holds for long GUI sessions, not only after each batch.
+EVICT_EVERY = 50
+# Bump when point generation or rendering changes, so old entries are not reused.
+CACHE_VERSION = 2
+
+def seed_id(seed):
+    # Stable text form of a seed: an int, or a SeedSequence child (its root
+    # entropy plus spawn key identify it).
+    if isinstance(seed, np.random.SeedSequence):
+        return f"{seed.entropy}:{seed.spawn_key}"
+    return str(seed)
+
+def geometry_key(seed, complexity, size):
+    return hashlib.sha256(f"{CACHE_VERSION}|{seed_id(seed)}|{complexity}|{size}".encode()).hexdigest()
+
+def image_key(seed, complexity, dimension, size):
+    return hashlib.sha256(f"{geometry_key(seed, complexity, size)}|{dimension}".encode()).hexdigest()
+
+class ShapeCache:
+    """
+    Content-addressed on-disk cache of generated patterns: Voronoi geometry
+    (vertices and deduplicated edges, shared by 2D and 3D) as .npz and the
+    encoded PNG per dimension. Files are written atomically, so several
+    worker processes can share the directory. Reads refresh a file's
+    modification time and evict() removes the least recently used files
+    once the directory grows past max_bytes; it runs every EVICT_EVERY
+    writes as well as when a batch finishes.
+    """
+
+    def __init__(self, path=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.writes = 0
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, key, ext):
+        return os.path.join(self.path, key + ext)
+
+    def _read(self, key, ext):
+        file_path = self._file(key, ext)
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+            os.utime(file_path)
+        except OSError:
+            return None
+        return data
+
+    def _write(self, key, ext, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._file(key, ext))
+        self.writes += 1
+        if self.writes % EVICT_EVERY == 0:
+            self.evict()
+
+    def get_geometry(self, key):
+        data = self._read(key, ".npz")
+        if data is None:
+            return None
+        with np.load(io.BytesIO(data)) as npz:
+            return npz["vertices"], npz["edges"]
+
+    def put_geometry(self, key, vertices, edges):
+        buffer = io.BytesIO()
+        np.savez(buffer, vertices=vertices, edges=edges)
+        self._write(key, ".npz", buffer.getvalue())
+
+    def get_png(self, key):
+        return self._read(key, ".png")
+
+    def put_png(self, key, png):
+        self._write(key, ".png", png)
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, file_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(file_path)
+            except OSError:
+                continue
+            total -= size
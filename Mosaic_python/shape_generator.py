@@ -1,21 +1,20 @@
 import os
-import math
+import io
+import concurrent.futures
 import random
 import numpy as np
-from PIL import Image, ImageDraw
+from PIL import Image
 from scipy.spatial import Voronoi
 from groq import Groq
 
-def draw_dotted_line(draw, start, end, dot_radius, gap):
-    dx = end[0] - start[0]
-    dy = end[1] - start[1]
-    dist = math.hypot(dx, dy)
-    steps = max(int(dist / gap), 1)
-    for i in range(steps + 1):
-        t = i / steps
-        x = start[0] + t * dx
-        y = start[1] + t * dy
-        draw.ellipse([x - dot_radius, y - dot_radius, x + dot_radius, y + dot_radius], fill=(0, 0, 0))
+from dot_renderer import render_edges, unique_edges
+from shape_cache import ShapeCache, geometry_key, image_key
+from vector_export import pdf_document, svg_document
+
+OUTPUT_FORMATS = ("png", "svg", "pdf")
+
+# Patterns generated with an explicit seed are kept here (see shape_cache.py).
+shape_cache = ShapeCache()
 
 def voronoi_finite_polygons_2d(vor, radius=None):
     if vor.points.shape[1] != 2:
@@ -52,43 +51,114 @@ def voronoi_finite_polygons_2d(vor, radius=None):
         new_regions.append(new_region)
     return new_regions, np.array(new_vertices)
 
-def generate_preview(complexity=5, dimension="2D"):
-    img = Image.new("RGB", (200, 200), (255, 255, 255))
-    draw = ImageDraw.Draw(img)
+def dot_style(dimension):
+    # (dot_radius, gap) of the dotted outlines.
+    return (1, 4) if dimension == "2D" else (2, 3)
+
+def pattern_geometry(points):
+    # Vertices and deduplicated edges of the Voronoi diagram of points.
+    regions, vertices = voronoi_finite_polygons_2d(Voronoi(points))
+    return vertices, unique_edges(regions)
+
+def render_geometry(vertices, edges, size, dimension):
+    # Drawn in grayscale, handed out as RGB like the patterns always were.
+    dot_radius, gap = dot_style(dimension)
+    return render_edges(vertices, edges, (size, size), dot_radius, gap).convert("RGB")
+
+def render_pattern(points, size, dimension):
+    return render_geometry(*pattern_geometry(points), size, dimension)
+
+def png_bytes(img):
+    buffer = io.BytesIO()
+    img.save(buffer, "PNG")
+    return buffer.getvalue()
+
+def seeded_geometry(seed, complexity, size, num_points, cache=None):
+    if cache is None:
+        return pattern_geometry(np.random.default_rng(seed).random((num_points, 2)) * size)
+    geometry_id = geometry_key(seed, complexity, size)
+    geometry = cache.get_geometry(geometry_id)
+    if geometry is None:
+        geometry = pattern_geometry(np.random.default_rng(seed).random((num_points, 2)) * size)
+        cache.put_geometry(geometry_id, *geometry)
+    return geometry
+
+def pattern_png(seed, complexity, dimension, size, num_points, cache=None):
+    """
+    PNG of the pattern drawn from seed. With a cache, the PNG is read back if
+    this (seed, complexity, dimension, size) was rendered before, and the
+    geometry is reused when only the dimension differs.
+    """
+    if cache is None:
+        return png_bytes(render_geometry(*seeded_geometry(seed, complexity, size, num_points), size, dimension))
+    key = image_key(seed, complexity, dimension, size)
+    png = cache.get_png(key)
+    if png is not None:
+        return png
+    png = png_bytes(render_geometry(*seeded_geometry(seed, complexity, size, num_points, cache), size, dimension))
+    cache.put_png(key, png)
+    return png
+
+def pattern_vector(seed, complexity, dimension, size, num_points, output_format, cache=None):
+    # SVG or PDF of the same pattern; only the geometry is worth caching.
+    vertices, edges = seeded_geometry(seed, complexity, size, num_points, cache)
+    dot_radius, gap = dot_style(dimension)
+    if output_format == "svg":
+        return svg_document(vertices, edges, (size, size), dot_radius, gap).encode("utf-8")
+    return pdf_document(vertices, edges, (size, size), dot_radius, gap)
+
+def generate_preview(complexity=5, dimension="2D", seed=None, cache=True):
+    # seed=None draws a fresh random pattern, which is never cached.
     num_points = int(10 + complexity * 3)
-    points = np.random.rand(num_points, 2) * 200
-    vor = Voronoi(points)
-    regions, vertices = voronoi_finite_polygons_2d(vor)
-    dot_radius = 1 if dimension == "2D" else 2
-    gap = 4 if dimension == "2D" else 3
-    for region in regions:
-        polygon = [tuple(vertices[v]) for v in region]
-        if len(polygon) > 2:
-            for j in range(len(polygon)):
-                start = polygon[j]
-                end = polygon[(j + 1) % len(polygon)]
-                draw_dotted_line(draw, start, end, dot_radius, gap)
-    return img
+    if seed is None:
+        return render_pattern(np.random.default_rng().random((num_points, 2)) * 200, 200, dimension)
+    png = pattern_png(seed, complexity, dimension, 200, num_points, shape_cache if cache else None)
+    return Image.open(io.BytesIO(png))
+
+def generate_shape(index, seed, complexity, output_dir, dimension, use_cache=False, output_format="png"):
+    # One pattern, rendered and saved; module level so worker processes can run it.
+    num_points = int(20 + complexity * 10)
+    cache = shape_cache if use_cache else None
+    if output_format == "png":
+        data = pattern_png(seed, complexity, dimension, 1000, num_points, cache)
+    else:
+        data = pattern_vector(seed, complexity, dimension, 1000, num_points, output_format, cache)
+    with open(os.path.join(output_dir, f"shape_{index + 1}.{output_format}"), "wb") as f:
+        f.write(data)
+    return index
 
-def generate_shapes(complexity=5, num_shapes=50, output_dir="shapes", dimension="2D", progress_callback=None):
+def generate_shapes(complexity=5, num_shapes=50, output_dir="shapes", dimension="2D", progress_callback=None,
+                    workers=1, seed=None, cache=True, output_format="png"):
+    """
+    Renders num_shapes patterns into output_dir, in this process by default
+    or on a pool of workers processes when asked (None: one per CPU). Every
+    shape gets its own child of SeedSequence(seed), so a given seed
+    reproduces the same files whatever the worker count; seed=None draws fresh entropy. With a
+    seed and cache, shapes rendered before are copied from shape_cache.
+    progress_callback(done, total) is called from this process as shapes
+    finish, in completion order. output_format "svg" or "pdf" writes the
+    deduplicated edges as dashed vector paths instead of a 1000x1000 PNG.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {output_format!r}; expected one of {', '.join(OUTPUT_FORMATS)}")
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
-    for i in range(num_shapes):
-        img = Image.new("RGB", (1000, 1000), (255, 255, 255))
-        draw = ImageDraw.Draw(img)
-        num_points = int(20 + complexity * 10)
-        points = np.random.rand(num_points, 2) * 1000
-        vor = Voronoi(points)
-        regions, vertices = voronoi_finite_polygons_2d(vor)
-        dot_radius = 1 if dimension == "2D" else 2
-        gap = 4 if dimension == "2D" else 3
-        for region in regions:
-            polygon = [tuple(vertices[v]) for v in region]
-            if len(polygon) > 2:
-                for j in range(len(polygon)):
-                    start = polygon[j]
-                    end = polygon[(j + 1) % len(polygon)]
-                    draw_dotted_line(draw, start, end, dot_radius, gap)
-        img.save(os.path.join(output_dir, f"shape_{i+1}.png"), "PNG")
-        if progress_callback:
-            progress_callback(i + 1, num_shapes)
+    seeds = np.random.SeedSequence(seed).spawn(num_shapes)
+    use_cache = cache and seed is not None
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or num_shapes < 2:
+        for i in range(num_shapes):
+            generate_shape(i, seeds[i], complexity, output_dir, dimension, use_cache, output_format)
+            if progress_callback:
+                progress_callback(i + 1, num_shapes)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, num_shapes)) as executor:
+            futures = [executor.submit(generate_shape, i, seeds[i], complexity, output_dir, dimension, use_cache,
+                                       output_format)
+                       for i in range(num_shapes)]
+            for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                future.result()
+                if progress_callback:
+                    progress_callback(done, num_shapes)
+    if use_cache:
+        shape_cache.evict()
@@ -0,0 +1,49 @@
+import zlib
+
+def edge_segments(vertices, edges):
+    # (x1, y1, x2, y2) per edge, rounded to 0.1 px to keep the files small.
+    for v1, v2 in edges:
+        (x1, y1), (x2, y2) = vertices[v1], vertices[v2]
+        yield round(float(x1), 1), round(float(y1), 1), round(float(x2), 1), round(float(y2), 1)
+
+def svg_document(vertices, edges, size, dot_radius, gap):
+    """
+    The pattern as SVG: all edges in one path, dotted with round caps on
+    zero-length dashes (stroke width 2 * dot_radius, a dot every gap units).
+    Dashing restarts at every subpath, so each edge starts on a dot as in
+    the raster version; edges running off the canvas are clipped by the
+    viewBox.
+    """
+    width, height = size
+    path = " ".join(f"M{x1:g} {y1:g}L{x2:g} {y2:g}" for x1, y1, x2, y2 in edge_segments(vertices, edges))
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}">'
+            f'<rect width="{width}" height="{height}" fill="#fff"/>'
+            f'<path d="{path}" fill="none" stroke="#000" stroke-width="{2 * dot_radius:g}" '
+            f'stroke-linecap="round" stroke-dasharray="0 {gap:g}"/></svg>\n')
+
+def pdf_document(vertices, edges, size, dot_radius, gap):
+    # Same drawing as svg_document in a one-page PDF (1 unit = 1 pt), with
+    # the y axis flipped to match image coordinates.
+    width, height = size
+    ops = [f"1 0 0 -1 0 {height} cm", f"0 0 {width} {height} re W n",
+           f"{2 * dot_radius:g} w 1 J [0 {gap:g}] 0 d"]
+    ops.extend(f"{x1:g} {y1:g} m {x2:g} {y2:g} l" for x1, y1, x2, y2 in edge_segments(vertices, edges))
+    ops.append("S")
+    content = zlib.compress("\n".join(ops).encode("ascii"))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] /Contents 4 0 R >>".encode("ascii"),
+        f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode("ascii") + content + b"\nendstream",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("ascii")
+    out += b"".join(f"{offset:010d} 00000 n \n".encode("ascii") for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("ascii")
+    return bytes(out)
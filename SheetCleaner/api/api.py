@@ -6,19 +6,23 @@ load_dotenv()
 
 client = Groq()
 
-def get_ai_response(prompt: str) -> str:
+MODEL = "qwen-2.5-32b"
+
+def get_ai_response(prompt: str, timeout: float = None) -> str:
     """
     Returns AI-generated text using the streaming chat completion endpoint.
     The function accumulates streamed chunks into a single response.
+    timeout (seconds) is passed to the client, which raises on expiry.
     """
     completion = client.chat.completions.create(
-        model="qwen-2.5-32b",
+        model=MODEL,
         messages=[{"role": "user", "content": prompt}],
         temperature=0.6,
         max_completion_tokens=4096,
         top_p=0.95,
         stream=True,
         stop=None,
+        timeout=timeout,
     )
     response = ""
     for chunk in completion:
@@ -31,7 +35,7 @@ def get_ai_output(prompt: str, output_type: str = "text") -> str:
     For text output, it returns the accumulated streamed text.
     """
     completion = client.chat.completions.create(
-        model="qwen-2.5-32b",
+        model=MODEL,
         messages=[{"role": "user", "content": prompt}],
         temperature=0.6,
         max_completion_tokens=4096,
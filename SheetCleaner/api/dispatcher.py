@@ -0,0 +1,128 @@
+import asyncio
+import random
+import threading
+import time
+
+from api.api import get_ai_response
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at rate_per_minute, holding at most
+    rate_per_minute tokens. acquire(n) reserves n tokens and waits until
+    they are paid back; requests larger than the bucket are capped so they
+    can still go through. The state sits behind a thread lock rather than
+    an asyncio one, so one bucket keeps counting across event loops (every
+    AIDispatcher.run is its own asyncio.run) and threads.
+    """
+
+    def __init__(self, rate_per_minute):
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self.rate = self.capacity / 60.0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, amount=1):
+        # Takes amount tokens, going into debt if needed, and returns how
+        # long the caller has to wait before using them.
+        amount = min(float(amount), self.capacity)
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            return max(0.0, -self.tokens / self.rate)
+
+    async def acquire(self, amount=1):
+        delay = self.reserve(amount)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+def is_retryable(error):
+    # 429 and 5xx responses, plus connection errors and timeouts, are worth
+    # another try; anything else (bad request, auth) is not.
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(error, ConnectionError) or is_timeout(error) or \
+        type(error).__name__ == "APIConnectionError"
+
+def is_timeout(error):
+    return isinstance(error, TimeoutError) or type(error).__name__ == "APITimeoutError"
+
+def retry_after(error):
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+class AIDispatcher:
+    """
+    Runs many get_ai_response calls concurrently. At most concurrency
+    requests are in flight, requests and tokens per minute are held to their
+    limits with token buckets shared by every run of the dispatcher, and
+    retryable failures back off exponentially (honouring Retry-After when
+    the API sends it). Each result is handed to
+    on_result(index, text) as soon as it arrives, so callers can write it
+    back to its cell whatever the completion order.
+    """
+
+    def __init__(self, concurrency=4, requests_per_minute=30, tokens_per_minute=6000,
+                 timeout=60, max_retries=5, base_delay=1.0, max_delay=30.0):
+        self.concurrency = concurrency
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+
+    async def _call(self, prompt, tokens, semaphore, timeout):
+        attempt = 0
+        while True:
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(tokens)
+            async with semaphore:
+                try:
+                    # The client enforces the timeout, so a slow request is
+                    # cancelled rather than left running behind a retry.
+                    return await asyncio.to_thread(get_ai_response, prompt, timeout)
+                except Exception as e:
+                    error = e
+            if attempt >= self.max_retries or not is_retryable(error):
+                if is_timeout(error):
+                    return "Error: AI Timeout."
+                return f"Error: {error}"
+            delay = retry_after(error)
+            if delay is None:
+                delay = min(self.max_delay, self.base_delay * 2 ** attempt) * (0.5 + random.random() / 2)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def run_async(self, requests, on_result=None, timeout=None):
+        # requests: list of (prompt, estimated_tokens). Returns replies in
+        # order; timeout overrides the dispatcher's for this run.
+        semaphore = asyncio.Semaphore(self.concurrency)
+        timeout = self.timeout if timeout is None else timeout
+        replies = [None] * len(requests)
+
+        async def run_one(index, prompt, tokens):
+            replies[index] = await self._call(prompt, tokens, semaphore, timeout)
+            if on_result is not None:
+                on_result(index, replies[index])
+
+        await asyncio.gather(*(run_one(i, prompt, tokens) for i, (prompt, tokens) in enumerate(requests)))
+        return replies
+
+    def run(self, requests, on_result=None, timeout=None):
+        """
+        Blocking entry point for worker threads that have no event loop of
+        their own (e.g. the GUI's background executor).
+        """
+        if not requests:
+            return []
+        return asyncio.run(self.run_async(requests, on_result, timeout))
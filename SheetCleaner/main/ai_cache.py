@@ -0,0 +1,81 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ai_cache.sqlite")
+
+def normalize_text(text):
+    # NFC so that composed and decomposed accents share one entry.
+    return unicodedata.normalize("NFC", text)
+
+def cache_key(model, prompt_version, text):
+    return hashlib.sha256(f"{model}\x00{prompt_version}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+class AICache:
+    """
+    On-disk SQLite map from (model, prompt template version, normalized cell
+    text) to the AI's cleaned value. Entries older than max_age_days are
+    dropped when the cache is opened, and once there are more than
+    max_entries the least recently used ones are evicted. One connection is
+    shared behind a lock, so an instance can be used from any thread.
+    """
+
+    def __init__(self, path=CACHE_FILE, max_entries=100000, max_age_days=90):
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 86400
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS ai_cache (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    prompt_version INTEGER,
+                    text TEXT,
+                    cleaned TEXT,
+                    created REAL,
+                    last_used REAL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS ai_cache_last_used ON ai_cache (last_used)")
+            self.conn.execute("DELETE FROM ai_cache WHERE created < ?", (time.time() - self.max_age,))
+
+    def get_many(self, model, prompt_version, texts):
+        # {text: cleaned} for the texts already in the cache.
+        keys = {cache_key(model, prompt_version, text): text for text in set(texts)}
+        found = {}
+        now = time.time()
+        with self.lock, self.conn:
+            key_list = list(keys)
+            for start in range(0, len(key_list), 500):
+                chunk = key_list[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT key, cleaned FROM ai_cache WHERE key IN ({placeholders}) AND created >= ?",
+                    chunk + [now - self.max_age]).fetchall()
+                for key, cleaned in rows:
+                    found[keys[key]] = cleaned
+                self.conn.executemany("UPDATE ai_cache SET last_used = ? WHERE key = ?",
+                                      [(now, key) for key, _ in rows])
+        return found
+
+    def put_many(self, model, prompt_version, items):
+        # items: {text: cleaned}
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO ai_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(cache_key(model, prompt_version, text), model, prompt_version, normalize_text(text), cleaned, now, now)
+                 for text, cleaned in items.items()])
+            count = self.conn.execute("SELECT COUNT(*) FROM ai_cache").fetchone()[0]
+            if count > self.max_entries:
+                self.conn.execute(
+                    "DELETE FROM ai_cache WHERE key IN (SELECT key FROM ai_cache ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,))
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
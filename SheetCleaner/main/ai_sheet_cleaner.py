@@ -2,26 +2,45 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
 import sys
-import re
-import requests
-import tempfile
+import json
 import pandas as pd
 import concurrent.futures
 import queue
-import threading
 
 # Add parent directory (which contains the 'api' folder) to sys.path.
 parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-from api.api import get_ai_response
+from api.api import MODEL
+from api.dispatcher import AIDispatcher
+from ai_cache import AICache
+from local_cleaner import clean_locally
+from char_policy import load_policy
+from paged_scan import ScanCheckpoint, scan_file
+from sheet_loaders import reader_for
+from sheet_stream import load_frames
+from web_fetch import scan_url, scan_urls
 
 # Global patterns and settings
-allowed_accents = "àáâãäåæçèéêëìíîïðñòóôõöøùúûüýþÿÀÁÂÃÄÅÆÇÈÉÊËÌÍÎÏÐÑÒÓÔÕÖØÙÚÛÜÝÞß.\\-'"
-allowed_chars = fr"a-zA-Z0-9\s{allowed_accents}"
-special_char_pattern = re.compile(fr"[^{allowed_chars}]")
-non_latin_pattern = re.compile(r"[^\u0000-\u007F]")
+# Allowed characters come from config.json, shared with scanner.py and cleaner.py.
+char_policy = load_policy()
+special_char_pattern = char_policy.pattern
+# Batched AI cleaning: estimated prompt tokens and cells per request, and the
+# timeout for one batch request.
+AI_BATCH_TOKEN_BUDGET = 1500
+AI_BATCH_MAX_CELLS = 50
+AI_BATCH_TIMEOUT = 60
+# Concurrent AI requests and the per-minute request/token limits they share.
+AI_CONCURRENCY = 4
+AI_REQUESTS_PER_MINUTE = 30
+AI_TOKENS_PER_MINUTE = 6000
+# Part of the AI cache key; bump it whenever the cleaning prompts change so
+# answers to the old prompts are not reused.
+PROMPT_VERSION = 1
+ai_cache = AICache()
+# Progress of the current scan, so an interrupted run resumes where it stopped.
+checkpoint = ScanCheckpoint(os.path.join(os.path.dirname(os.path.abspath(__file__)), "ai_scan_checkpoint.sqlite"))
 
 # Supported file extensions (many sheet formats)
 supported_extensions = (
@@ -31,7 +50,13 @@ supported_extensions = (
 
 def load_sheets(file_path):
     ext = os.path.splitext(file_path)[1].lower()
-    if ext in (".xls", ".xlsx", ".xlsm", ".xlsb", ".ods"):
+    if reader_for(file_path) is not None:
+        # .xlsx/.xlsm, .xlsb, .ods, .slk and .dif have their own row readers.
+        try:
+            return load_frames(file_path)
+        except Exception:
+            return {}
+    elif ext == ".xls":
         try:
             xls = pd.ExcelFile(file_path)
         except Exception:
@@ -61,88 +86,221 @@ def load_sheets(file_path):
             return {"Sheet1": df}
         except Exception:
             return {}
-    elif ext in (".slk", ".dif"):
-        try:
-            df = pd.read_csv(file_path, dtype=str, encoding="utf-8", errors="replace")
-            return {"Sheet1": df}
-        except Exception:
-            return {}
     else:
         # For unsupported formats (e.g. .gsheet, .numbers, etc.) we simply return empty.
         return {}
 
-def get_ai_response_with_timeout(prompt, timeout=10):
-    # Reduced timeout for testing
-    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-        future = executor.submit(get_ai_response, prompt)
+# One dispatcher for the whole process, so the per-minute limits hold across
+# pages, sheets and retries rather than restarting with every call.
+ai_dispatcher = AIDispatcher(concurrency=AI_CONCURRENCY, requests_per_minute=AI_REQUESTS_PER_MINUTE,
+                             tokens_per_minute=AI_TOKENS_PER_MINUTE, timeout=AI_BATCH_TIMEOUT)
+
+def request_tokens(prompt):
+    # Prompt plus a reply of about the same size.
+    return 2 * estimate_tokens(prompt)
+
+def build_cell_prompt(text):
+    return (
+        "Clean the following text by removing any characters that are not letters "
+        "(including accented letters), digits, whitespace, or the following punctuation: . - '\n"
+        f"Original text: {text}\n"
+        "Return only the cleaned text."
+    )
+
+def build_batch_prompt(items):
+    # items: list of (id, text). The reply is asked for in the same JSON shape
+    # so each answer can be matched back to its cell by id.
+    payload = json.dumps([{"id": item_id, "text": text} for item_id, text in items], ensure_ascii=False)
+    return (
+        "Clean each text in the JSON array below by removing any characters that are not letters "
+        "(including accented letters), digits, whitespace, or the following punctuation: . - '\n"
+        "Reply with only a JSON array of objects with the same \"id\" and a \"cleaned\" field, "
+        "one per input item, and nothing else.\n"
+        f"{payload}"
+    )
+
+def estimate_tokens(text):
+    # Rough count (about 4 characters per token), plus JSON/id overhead per item.
+    return len(text) // 4 + 8
+
+def iter_batches(items, token_budget=AI_BATCH_TOKEN_BUDGET, max_cells=AI_BATCH_MAX_CELLS):
+    batch = []
+    used = 0
+    for item in items:
+        cost = estimate_tokens(item[1])
+        if batch and (used + cost > token_budget or len(batch) >= max_cells):
+            yield batch
+            batch = []
+            used = 0
+        batch.append(item)
+        used += cost
+    if batch:
+        yield batch
+
+def parse_batch_reply(reply, expected_ids):
+    # Returns {id: cleaned} for the well-formed entries of a batch reply; ids
+    # that are missing, unknown or malformed are simply left out.
+    start = reply.find("[")
+    end = reply.rfind("]")
+    if start == -1 or end <= start:
+        return {}
+    try:
+        entries = json.loads(reply[start:end + 1])
+    except ValueError:
+        return {}
+    cleaned = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict) or not isinstance(entry.get("cleaned"), str):
+            continue
         try:
-            return future.result(timeout=timeout)
-        except concurrent.futures.TimeoutError:
-            return "Error: AI Timeout."
+            item_id = int(entry.get("id"))
+        except (TypeError, ValueError):
+            continue
+        if item_id in expected_ids:
+            cleaned[item_id] = entry["cleaned"]
+    return cleaned
+
+def clean_cells(texts, log_queue):
+    """
+    Cleans each text with its own AI request; requests run concurrently
+    through the dispatcher. Returns the cleaned texts in order.
+    """
+    prompts = [build_cell_prompt(text) for text in texts]
+    log_queue.put(f"Prompting AI for {len(prompts)} cells")
+    return ai_dispatcher.run([(prompt, request_tokens(prompt)) for prompt in prompts], timeout=10)
+
+def clean_cells_batched(texts, log_queue):
+    """
+    Cleans a list of texts with one AI request per batch of cells, sized by
+    AI_BATCH_TOKEN_BUDGET / AI_BATCH_MAX_CELLS, with the batches sent
+    concurrently. Cells whose answer is missing from a batch reply (timeout,
+    malformed JSON, dropped ids) are retried one at a time with the
+    single-cell prompt. Returns the cleaned texts in order.
+    """
+    cleaned = [None] * len(texts)
+    batches = list(iter_batches(list(enumerate(texts))))
+    missing = []
+
+    def on_batch(index, reply):
+        batch = batches[index]
+        answers = parse_batch_reply(reply, {item_id for item_id, _ in batch})
+        log_queue.put(f"Received AI response for batch {index + 1}: {len(answers)} of {len(batch)} cells")
+        for item_id, text in batch:
+            if item_id in answers:
+                cleaned[item_id] = answers[item_id]
+            else:
+                missing.append(item_id)
+
+    log_queue.put(f"Prompting AI for {len(texts)} cells in {len(batches)} batches")
+    prompts = [build_batch_prompt(batch) for batch in batches]
+    ai_dispatcher.run([(prompt, request_tokens(prompt)) for prompt in prompts], on_batch)
+    if missing:
+        log_queue.put(f"Retrying {len(missing)} cells on their own")
+        retries = clean_cells([texts[item_id] for item_id in missing], log_queue)
+        for item_id, reply in zip(missing, retries):
+            cleaned[item_id] = reply
+    return cleaned
 
-def process_df(file_name, sheet_name, df, results, log_queue):
+def process_df(file_name, sheet_name, df, results, log_queue, batch=True, local_first=True):
     emplid_column = None
     for col in df.columns:
         if "EMPLID" in col.upper():
             emplid_column = col
             break
 
-    # Limit to first 50 rows for testing
-    for row_idx, row in df.head(50).iterrows():
+    # Flagged cells are collected first so they can be sent to the AI in
+    # batches; with batch=False each cell gets its own request. With
+    # local_first, cells the deterministic clean_locally pass can fix with
+    # confidence never reach the AI. "Cleaning Tier" records local/cache/ai.
+    flagged = []
+    for row_idx, row in df.iterrows():
         emplid_value = row[emplid_column] if emplid_column in df.columns else "N/A"
         for col_idx, cell_value in enumerate(row):
             if pd.notna(cell_value):
                 cell_str = str(cell_value)
-                special_chars = special_char_pattern.findall(cell_str)
-                non_latin_chars = non_latin_pattern.findall(cell_str)
+                special_chars, non_latin_chars = char_policy.offending(cell_str)
                 if special_chars or non_latin_chars:
                     truncated_text = cell_str if len(cell_str) < 1000 else cell_str[:1000] + "..."
-                    prompt = (
-                        "Clean the following text by removing any characters that are not letters "
-                        "(including accented letters), digits, whitespace, or the following punctuation: . - '\n"
-                        f"Original text: {truncated_text}\n"
-                        "Return only the cleaned text."
-                    )
-                    log_queue.put(f"Prompting AI for row={row_idx+1}, col={df.columns[col_idx]}")
-                    ai_cleaned = get_ai_response_with_timeout(prompt, timeout=10)
-                    log_queue.put(f"Received AI response for row={row_idx+1}, col={df.columns[col_idx]}")
-                    results.append({
+                    flagged.append((truncated_text, {
                         "File Name": file_name,
                         "Sheet Name": sheet_name,
                         "EMPLID": emplid_value,
                         "Row": row_idx + 1,
                         "Column": df.columns[col_idx],
                         "Original Cell Value": cell_str,
-                        "Special Characters": ''.join(sorted(set(special_chars))),
-                        "Non-Latin Characters": ''.join(sorted(set(non_latin_chars))),
-                        "AI Cleaned Value": ai_cleaned
-                    })
+                        "Special Characters": special_chars,
+                        "Non-Latin Characters": non_latin_chars
+                    }))
+    if not flagged:
+        return
+
+    local = {}
+    if local_first:
+        for i, (_, result) in enumerate(flagged):
+            cleaned, reason = clean_locally(result["Original Cell Value"], special_char_pattern)
+            if reason is None:
+                local[i] = cleaned
+        log_queue.put(f"Local pass fixed {len(local)} of {len(flagged)} flagged cells "
+                      f"in {file_name} - {sheet_name}; {len(flagged) - len(local)} go to the AI")
+
+    # Cached answers skip the network; each distinct uncached text is sent once.
+    texts = [text for i, (text, _) in enumerate(flagged) if i not in local]
+    cached = ai_cache.get_many(MODEL, PROMPT_VERSION, texts) if texts else {}
+    answers = {}
+    if texts:
+        hits = sum(1 for text in texts if text in cached)
+        log_queue.put(f"AI cache: {hits} of {len(texts)} cells served from cache ({hits / len(texts):.0%})")
+        to_ask = list(dict.fromkeys(text for text in texts if text not in cached))
+        if to_ask:
+            replies = clean_cells_batched(to_ask, log_queue) if batch else clean_cells(to_ask, log_queue)
+            answers = dict(zip(to_ask, replies))
+            ai_cache.put_many(MODEL, PROMPT_VERSION, {text: reply for text, reply in answers.items()
+                                                      if reply is not None and not reply.startswith("Error:")})
+    for i, (text, result) in enumerate(flagged):
+        if i in local:
+            result["AI Cleaned Value"] = None
+            result["AI Cache"] = None
+            result["Cleaned Value"] = local[i]
+            result["Cleaning Tier"] = "local"
+        else:
+            result["AI Cleaned Value"] = cached[text] if text in cached else answers.get(text)
+            result["AI Cache"] = "hit" if text in cached else "miss"
+            result["Cleaned Value"] = result["AI Cleaned Value"]
+            result["Cleaning Tier"] = "cache" if text in cached else "ai"
+        results.append(result)
+
+def summarize_results(results):
+    """
+    One summary row for the report: how many flagged cells each cleaning
+    tier handled and the AI cache hit rate over the cells that needed the AI.
+    """
+    tiers = {tier: sum(1 for result in results if result.get("Cleaning Tier") == tier)
+             for tier in ("local", "cache", "ai")}
+    sent = tiers["cache"] + tiers["ai"]
+    return {
+        "Flagged Cells": len(results),
+        "Fixed Locally": tiers["local"],
+        "From AI Cache": tiers["cache"],
+        "By AI": tiers["ai"],
+        "AI Cache Hit Rate": f"{tiers['cache'] / sent:.0%}" if sent else "",
+    }
 
 def process_file(file_path, results, log_queue):
-    file_name = os.path.basename(file_path)
-    log_queue.put(f"Processing file: {file_name}")
-    sheets = load_sheets(file_path)
-    if not sheets:
-        log_queue.put(f"No sheets loaded from {file_name}.")
-        return
-    for sheet_name, df in sheets.items():
-        process_df(file_name, sheet_name, df, results, log_queue)
+    # Every row is scanned, one page at a time, with progress checkpointed.
+    scan_file(file_path, load_sheets, process_df, results, log_queue, checkpoint)
 
 def process_web_link(url, results, log_queue):
     try:
         log_queue.put(f"Downloading file from URL: {url}")
-        response = requests.get(url)
-        response.raise_for_status()
-        suffix = os.path.splitext(url)[1]
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-            tmp_file.write(response.content)
-            temp_file_path = tmp_file.name
-        log_queue.put(f"Downloaded file to {temp_file_path}")
-        process_file(temp_file_path, results, log_queue)
-        os.remove(temp_file_path)
+        scan_url(url, process_file, process_df, results, log_queue)
     except Exception as e:
         log_queue.put(f"Error processing web link {url}: {e}")
 
+def process_web_links(urls, results, log_queue):
+    # Several URLs (whitespace separated) are downloaded concurrently through
+    # the pooled session.
+    scan_urls(urls.split(), process_web_link, results, log_queue)
+
 def process_folder(folder_path, results, log_queue):
     for root, _, files in os.walk(folder_path):
         for file in files:
@@ -191,6 +349,9 @@ class SheetScannerGUI(tk.Tk):
         
         self.text_log = tk.Text(self, height=15)
         self.text_log.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+
+        self.status_label = tk.Label(self, text="Status: Idle")
+        self.status_label.pack(padx=10, pady=5, fill=tk.X)
         
         self.update_input_frame()
 
@@ -237,44 +398,64 @@ class SheetScannerGUI(tk.Tk):
         """
         while not self.log_queue.empty():
             message = self.log_queue.get_nowait()
-            self.text_log.insert(tk.END, message + "\n")
-            self.text_log.see(tk.END)
+            if message.startswith("STATUS:"):
+                self.status_label.config(text=message.replace("STATUS:", "").strip())
+            else:
+                self.text_log.insert(tk.END, message + "\n")
+                self.text_log.see(tk.END)
         self.after(100, self.process_log_queue)
 
     def start_processing(self):
         self.btn_process.config(state=tk.DISABLED)
         self.text_log.delete(1.0, tk.END)
+        self.status_label.config(text="Status: Processing...")
         user_input = self.entry_input.get().strip()
         input_type = self.input_type_var.get()
         results = []
+        if checkpoint.has_progress():
+            self.log("Resuming the interrupted scan from its checkpoint.")
 
         def processing_task():
             if input_type == "web":
-                process_web_link(user_input, results, self.log)
+                process_web_links(user_input, results, self.log_queue)
             elif input_type == "file":
                 if os.path.isfile(user_input):
-                    process_file(user_input, results, self.log)
+                    process_file(user_input, results, self.log_queue)
                 else:
                     self.log("Invalid file path.")
             elif input_type == "folder":
                 if os.path.isdir(user_input):
-                    process_folder(user_input, results, self.log)
+                    process_folder(user_input, results, self.log_queue)
                 else:
                     self.log("Invalid folder path.")
             
             if results:
+                summary = summarize_results(results)
+                sent = summary["From AI Cache"] + summary["By AI"]
+                self.log(f"Cells fixed locally: {summary['Fixed Locally']}, from AI cache: {summary['From AI Cache']}, "
+                         f"by AI: {summary['By AI']}")
+                if sent:
+                    self.log(f"AI cache hit rate: {summary['From AI Cache']} of {sent} cells "
+                             f"({summary['AI Cache Hit Rate']})")
                 output_file = os.path.join(os.getcwd(), "ai_cleaned_report.csv")
                 df_output = pd.DataFrame(results)
                 df_output.to_csv(output_file, index=False, encoding="utf-8")
-                self.log(f"✅ AI Cleaned Report saved: {output_file}")
+                # The Summary goes next to the rows, as Excel_Cleaner's CSV report does.
+                summary_file = os.path.join(os.getcwd(), "ai_cleaned_report_summary.csv")
+                pd.DataFrame([summary]).to_csv(summary_file, index=False, encoding="utf-8")
+                self.log(f"✅ AI Cleaned Report saved: {output_file} (summary: {summary_file})")
                 # Show a messagebox from the main thread
                 self.after(0, lambda: messagebox.showinfo("Process Complete", f"AI Cleaned Report saved:\n{output_file}"))
             else:
                 self.log("✅ No unwanted special characters found.")
                 self.after(0, lambda: messagebox.showinfo("Process Complete", "No unwanted special characters found."))
 
+            # The run finished, so the next one starts from scratch.
+            checkpoint.clear()
+
             # Re-enable the "Process" button
             self.after(0, lambda: self.btn_process.config(state=tk.NORMAL))
+            self.after(0, lambda: self.status_label.config(text="Status: Idle"))
 
         # Submit the task to our ThreadPoolExecutor
         self.executor.submit(processing_task)
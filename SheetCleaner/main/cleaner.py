@@ -1,9 +1,9 @@
 import os
-import json
 import pandas as pd
-import re
 import sys
 
+from char_policy import load_policy
+
 # OPTIONAL: only if you want to fix "ValÃ©rie" -> "Valérie"
 try:
     from ftfy import fix_text
@@ -23,44 +23,8 @@ sys.stdout.reconfigure(encoding='utf-8')
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 INPUT_FOLDER = r"C:\Users\Y.CHEHBOUB\Downloads\O3_Test\Here\SheetCleaner\input"
 OUTPUT_XLSX = os.path.join(INPUT_FOLDER, r"C:\Users\Y.CHEHBOUB\Downloads\O3_Test\Here\SheetCleaner\output\output.xlsx")
-CONFIG_FILE = os.path.join(BASE_DIR, "config.json")
-
-def load_config():
-    """
-    Loads a JSON file (config.json) with two keys:
-      - allowed_accents: list of individual accented/punctuation characters
-      - allowed_chars_prefix: list of strings (like 'a-zA-Z0-9', '\\s', etc.)
-    If config.json doesn't exist or is incomplete, defaults are used.
-    """
-    defaults = {
-        "allowed_accents": list("àáâãäåæçèéêëìíîïðñòóôõöøùúûüýþÿÀÁÂÃÄÅÆÇÈÉÊËÌÍÎÏÐÑÒÓÔÕÖØÙÚÛÜÝÞß.\\-'"),
-        "allowed_chars_prefix": ["a-zA-Z0-9", "\\s"]
-    }
-    if os.path.exists(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                config = json.load(f)
-            # Ensure required keys exist
-            for key in defaults:
-                if key not in config:
-                    config[key] = defaults[key]
-            return config
-        except Exception as e:
-            print(f"Error reading config file: {e}")
-            return defaults
-    else:
-        return defaults
-
-config = load_config()
-
-# Build the allowed characters pattern
-allowed_accents = "".join(config.get("allowed_accents", []))
-allowed_chars_prefix = "".join(config.get("allowed_chars_prefix", []))
-allowed_chars = allowed_chars_prefix + allowed_accents
-
-# Compile regex patterns
-special_char_pattern = re.compile(fr"[^{allowed_chars}]")
-non_latin_pattern = re.compile(r"[^\u0000-\u007F]")
+# Allowed characters come from config.json (see char_policy.py).
+char_policy = load_policy(os.path.join(BASE_DIR, "config.json"))
 
 results = []
 
@@ -91,8 +55,7 @@ for file_name in os.listdir(INPUT_FOLDER):
                             cell_str = fix_broken_text(cell_str)
 
                             # Check for special or non-latin characters
-                            special_chars = special_char_pattern.findall(cell_str)
-                            non_latin_chars = non_latin_pattern.findall(cell_str)
+                            special_chars, non_latin_chars = char_policy.offending(cell_str)
                             if special_chars or non_latin_chars:
                                 results.append([
                                     file_name,
@@ -101,8 +64,8 @@ for file_name in os.listdir(INPUT_FOLDER):
                                     row_idx + 1,
                                     df.columns[col_idx],
                                     cell_str,
-                                    ''.join(sorted(set(special_chars))),
-                                    ''.join(sorted(set(non_latin_chars)))
+                                    special_chars,
+                                    non_latin_chars
                                 ])
         except Exception as e:
             print(f"Error processing {file_name}: {e}")
@@ -0,0 +1,72 @@
+import re
+import unicodedata
+
+# OPTIONAL: ftfy repairs mojibake such as "ValÃ©rie" -> "Valérie"
+try:
+    from ftfy import fix_text
+    def fix_broken_text(text: str) -> str:
+        return fix_text(text)
+except ImportError:
+    def fix_broken_text(text: str) -> str:
+        return text
+
+# Typographic look-alikes of the allowed punctuation.
+PUNCTUATION_MAP = str.maketrans({
+    "’": "'", "‘": "'", "‛": "'", "`": "'", "´": "'",
+    "–": "-", "—": "-", "‐": "-", "‑": "-", "−": "-",
+    "\u00a0": " ", "\u2007": " ", "\u202f": " ",
+})
+# Byte sequences typical of UTF-8 text decoded as Latin-1/cp1252 that ftfy
+# could not (or was not installed to) repair.
+mojibake_pattern = re.compile(r"[ÃÂÅÐÑâ][\u0080-¿‘-›€ŒœŠšŽžŸ]")
+
+def fold_accent(ch, special_char_pattern):
+    # A disallowed accented letter becomes its base letter when that one is
+    # allowed and the rest of its canonical decomposition is combining marks
+    # (ő -> o, ş -> s); anything else is left for the strip.
+    decomposed = unicodedata.normalize("NFD", ch)
+    base, marks = decomposed[0], decomposed[1:]
+    if marks and all(unicodedata.category(m) == "Mn" for m in marks) and not special_char_pattern.match(base):
+        return base
+    return ch
+
+def has_compatibility_form(ch):
+    # True for characters such as ½, ™, ², № or … that stand for other
+    # text; stripping them loses meaning, and folding them is not safe.
+    return unicodedata.normalize("NFKD", ch) != ch
+
+def scripts(text):
+    # Unicode script names (LATIN, CYRILLIC, GREEK, CJK, ...) of the letters in text.
+    found = set()
+    for ch in text:
+        if ch.isalpha():
+            name = unicodedata.name(ch, "")
+            if name:
+                found.add(name.split()[0])
+    return found
+
+def clean_locally(text, special_char_pattern):
+    """
+    Deterministic fix for one cell: ftfy repair, NFC, punctuation look-alikes,
+    accent folding for disallowed accented letters, then removal of whatever
+    is still disallowed. Returns (cleaned, reason); reason is None when the
+    result can be trusted, otherwise a short note on why the cell still needs
+    the AI.
+    """
+    fixed = unicodedata.normalize("NFC", fix_broken_text(text)).translate(PUNCTUATION_MAP)
+    fixed = special_char_pattern.sub(lambda m: fold_accent(m.group(), special_char_pattern), fixed)
+    if mojibake_pattern.search(fixed):
+        return fixed, "mojibake"
+    removed = "".join(special_char_pattern.findall(fixed))
+    cleaned = special_char_pattern.sub("", fixed)
+    removed_scripts = scripts(removed)
+    if removed_scripts:
+        # Dropping letters loses information (a transliteration is needed).
+        if "LATIN" in scripts(cleaned) and removed_scripts - {"LATIN"}:
+            return cleaned, "mixed scripts"
+        return cleaned, "disallowed letters"
+    if any(has_compatibility_form(ch) for ch in removed):
+        return cleaned, "no local fold"
+    if not cleaned.strip() and text.strip():
+        return cleaned, "nothing left"
+    return cleaned, None
@@ -1,129 +1,16 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
-import sys
-import re
-import requests
-import tempfile
-import pandas as pd
-import concurrent.futures
+import time
 import queue
+import concurrent.futures
 
-parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-if parent_dir not in sys.path:
-    sys.path.insert(0, parent_dir)
-
-allowed_accents = "àáâãäåæçèéêëìíîïðñòóôõöøùúûüýþÿÀÁÂÃÄÅÆÇÈÉÊËÌÍÎÏÐÑÒÓÔÕÖØÙÚÛÜÝÞß.\\-'"
-allowed_chars = fr"a-zA-Z0-9\s{allowed_accents}"
-special_char_pattern = re.compile(fr"[^{allowed_chars}]")
-non_latin_pattern = re.compile(r"[^\u0000-\u007F]")
-supported_extensions = (
-    ".xls", ".xlsx", ".xlsm", ".xlsb", ".gsheet", ".ods", ".csv", ".tsv", ".numbers",
-    ".123", ".wk1", ".wk3", ".wk4", ".qpw", ".wb1", ".wb2", ".wb3", ".slk", ".dif", ".xml"
-)
-
-def load_sheets(file_path):
-    ext = os.path.splitext(file_path)[1].lower()
-    if ext in (".xls", ".xlsx", ".xlsm", ".xlsb", ".ods"):
-        try:
-            xls = pd.ExcelFile(file_path)
-        except Exception:
-            return {}
-        sheets = {}
-        for sheet_name in xls.sheet_names:
-            try:
-                sheets[sheet_name] = pd.read_excel(xls, sheet_name=sheet_name, dtype=str)
-            except Exception:
-                continue
-        return sheets
-    elif ext == ".csv":
-        try:
-            df = pd.read_csv(file_path, dtype=str, encoding="utf-8", errors="replace")
-            return {"Sheet1": df}
-        except Exception:
-            return {}
-    elif ext == ".tsv":
-        try:
-            df = pd.read_csv(file_path, dtype=str, sep="\t", encoding="utf-8", errors="replace")
-            return {"Sheet1": df}
-        except Exception:
-            return {}
-    elif ext == ".xml":
-        try:
-            df = pd.read_xml(file_path)
-            return {"Sheet1": df}
-        except Exception:
-            return {}
-    elif ext in (".slk", ".dif"):
-        try:
-            df = pd.read_csv(file_path, dtype=str, encoding="utf-8", errors="replace")
-            return {"Sheet1": df}
-        except Exception:
-            return {}
-    else:
-        return {}
-
-def process_df(file_name, sheet_name, df, results, log_queue):
-    emplid_column = None
-    for col in df.columns:
-        if "EMPLID" in col.upper():
-            emplid_column = col
-            break
-    rows = df.head(50)
-    total_rows = len(rows)
-    for row_idx, row in rows.iterrows():
-        emplid_value = row[emplid_column] if emplid_column in df.columns else "N/A"
-        for col_idx, cell_value in enumerate(row):
-            if pd.notna(cell_value):
-                cell_str = str(cell_value)
-                special_chars = special_char_pattern.findall(cell_str)
-                non_latin_chars = non_latin_pattern.findall(cell_str)
-                if special_chars or non_latin_chars:
-                    log_queue.put(f"Processing: {file_name} - {sheet_name} (row {row_idx+1}, column {df.columns[col_idx]})")
-                    results.append({
-                        "File Name": file_name,
-                        "Sheet Name": sheet_name,
-                        "EMPLID": emplid_value,
-                        "Row": row_idx + 1,
-                        "Column": df.columns[col_idx],
-                        "Original Cell Value": cell_str,
-                        "Special Characters": ''.join(sorted(set(special_chars))),
-                        "Non-Latin Characters": ''.join(sorted(set(non_latin_chars)))
-                    })
-        log_queue.put(f"STATUS: Processed row {row_idx+1} of {total_rows} in {file_name} - {sheet_name}")
-
-def process_file(file_path, results, log_queue):
-    file_name = os.path.basename(file_path)
-    log_queue.put(f"Processing file: {file_name}")
-    sheets = load_sheets(file_path)
-    if not sheets:
-        log_queue.put(f"No sheets loaded from {file_name}.")
-        return
-    for sheet_name, df in sheets.items():
-        process_df(file_name, sheet_name, df, results, log_queue)
-
-def process_web_link(url, results, log_queue):
-    try:
-        log_queue.put(f"Downloading file from URL: {url}")
-        response = requests.get(url)
-        response.raise_for_status()
-        suffix = os.path.splitext(url)[1]
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-            tmp_file.write(response.content)
-            temp_file_path = tmp_file.name
-        log_queue.put(f"Downloaded file to {temp_file_path}")
-        process_file(temp_file_path, results, log_queue)
-        os.remove(temp_file_path)
-    except Exception as e:
-        log_queue.put(f"Error processing web link {url}: {e}")
+from scanner import run_scan
 
-def process_folder(folder_path, results, log_queue):
-    for root, _, files in os.walk(folder_path):
-        for file in files:
-            ext = os.path.splitext(file)[1].lower()
-            if ext in supported_extensions:
-                file_path = os.path.join(root, file)
-                process_file(file_path, results, log_queue)
+# The log widget is refreshed at most every LOG_REFRESH_MS with everything
+# queued since the last refresh, and keeps only the last LOG_MAX_LINES lines.
+LOG_REFRESH_MS = 200
+LOG_MAX_LINES = 2000
 
 class SheetScannerGUI(tk.Tk):
     def __init__(self):
@@ -134,7 +21,7 @@ class SheetScannerGUI(tk.Tk):
         self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
         self.log_queue = queue.Queue()
         self.create_widgets()
-        self.after(100, self.process_log_queue)
+        self.after(LOG_REFRESH_MS, self.process_log_queue)
 
     def create_widgets(self):
         self.input_type_var = tk.StringVar(value="file")
@@ -182,14 +69,29 @@ class SheetScannerGUI(tk.Tk):
         self.log_queue.put(message)
 
     def process_log_queue(self):
-        while not self.log_queue.empty():
-            message = self.log_queue.get_nowait()
+        # Drains everything queued since the last tick: only the latest STATUS
+        # is shown, and log lines go into the widget as one insert.
+        lines = []
+        status = None
+        deadline = time.monotonic() + LOG_REFRESH_MS / 2000
+        while time.monotonic() < deadline:
+            try:
+                message = self.log_queue.get_nowait()
+            except queue.Empty:
+                break
             if message.startswith("STATUS:"):
-                self.status_label.config(text=message.replace("STATUS:", "").strip())
+                status = message
             else:
-                self.text_log.insert(tk.END, message + "\n")
-                self.text_log.see(tk.END)
-        self.after(100, self.process_log_queue)
+                lines.append(message)
+        if status is not None:
+            self.status_label.config(text=status.replace("STATUS:", "").strip())
+        if lines:
+            self.text_log.insert(tk.END, "\n".join(lines[-LOG_MAX_LINES:]) + "\n")
+            excess = int(self.text_log.index("end-1c").split(".")[0]) - 1 - LOG_MAX_LINES
+            if excess > 0:
+                self.text_log.delete("1.0", f"{excess + 1}.0")
+            self.text_log.see(tk.END)
+        self.after(LOG_REFRESH_MS, self.process_log_queue)
 
     def start_processing(self):
         self.btn_process.config(state=tk.DISABLED)
@@ -197,28 +99,13 @@ class SheetScannerGUI(tk.Tk):
         self.status_label.config(text="Status: Processing...")
         user_input = self.entry_input.get().strip()
         input_type = self.input_type_var.get()
-        results = []
+        output_file = os.path.join(os.getcwd(), "scanned_report.csv")
         def processing_task():
-            if input_type == "web":
-                process_web_link(user_input, results, self.log)
-            elif input_type == "file":
-                if os.path.isfile(user_input):
-                    process_file(user_input, results, self.log)
-                else:
-                    self.log("Invalid file path.")
-            elif input_type == "folder":
-                if os.path.isdir(user_input):
-                    process_folder(user_input, results, self.log)
-                else:
-                    self.log("Invalid folder path.")
-            if results:
-                output_file = os.path.join(os.getcwd(), "scanned_report.csv")
-                df_output = pd.DataFrame(results)
-                df_output.to_csv(output_file, index=False, encoding="utf-8")
-                self.log(f"Scan report saved: {output_file}")
+            # The scan itself never touches Tk; it only feeds log_queue.
+            written = run_scan(input_type, user_input, output_file, self.log_queue)
+            if written:
                 self.after(0, lambda: messagebox.showinfo("Process Complete", f"Scan report saved:\n{output_file}"))
             else:
-                self.log("No unwanted special characters found.")
                 self.after(0, lambda: messagebox.showinfo("Process Complete", "No unwanted special characters found."))
             self.after(0, lambda: self.btn_process.config(state=tk.NORMAL))
             self.after(0, lambda: self.status_label.config(text="Status: Idle"))
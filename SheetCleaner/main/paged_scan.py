@@ -0,0 +1,157 @@
+import os
+import json
+import sqlite3
+import threading
+
+from sheet_stream import iter_sheets
+
+CHECKPOINT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scan_checkpoint.sqlite")
+
+def json_value(value):
+    # NumPy scalars (row numbers, EMPLIDs) are stored as plain Python values.
+    return value.item() if hasattr(value, "item") else str(value)
+
+class ScanCheckpoint:
+    """
+    On-disk progress of a scan: for each file, the sheet and row offset of the
+    last fully scanned page plus the report rows found so far. A file is only
+    resumed if its size and modification time are unchanged; otherwise it is
+    scanned from the start. clear() is called once a run finishes normally,
+    so only an interrupted run (crash, GUI closed) leaves anything behind.
+    """
+
+    def __init__(self, path=CHECKPOINT_FILE):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS progress (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER,
+                    mtime_ns INTEGER,
+                    sheet_index INTEGER,
+                    row_offset INTEGER,
+                    done INTEGER
+                );
+                CREATE TABLE IF NOT EXISTS results (
+                    path TEXT,
+                    result TEXT
+                );
+                CREATE INDEX IF NOT EXISTS results_path ON results (path);
+            """)
+
+    def resume_point(self, file_path):
+        # (sheet_index, row_offset, done, previous_results), or None to start over.
+        path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        with self.lock:
+            entry = self.conn.execute("SELECT size, mtime_ns, sheet_index, row_offset, done FROM progress WHERE path = ?",
+                                      (path,)).fetchone()
+            if entry is None or entry[0] != stat.st_size or entry[1] != stat.st_mtime_ns:
+                return None
+            previous = [json.loads(result) for (result,) in
+                        self.conn.execute("SELECT result FROM results WHERE path = ? ORDER BY rowid", (path,))]
+        return entry[2], entry[3], bool(entry[4]), previous
+
+    def start(self, file_path):
+        path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM results WHERE path = ?", (path,))
+            self.conn.execute("INSERT OR REPLACE INTO progress VALUES (?, ?, ?, 0, 0, 0)",
+                              (path, stat.st_size, stat.st_mtime_ns))
+
+    def save_page(self, file_path, sheet_index, row_offset, new_results):
+        # Results and the new offset go in one transaction, so a resume never
+        # repeats or loses a page.
+        path = os.path.abspath(file_path)
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT INTO results (path, result) VALUES (?, ?)",
+                                  [(path, json.dumps(result, default=json_value, ensure_ascii=False))
+                                   for result in new_results])
+            self.conn.execute("UPDATE progress SET sheet_index = ?, row_offset = ? WHERE path = ?",
+                              (sheet_index, row_offset, path))
+
+    def finish(self, file_path):
+        with self.lock, self.conn:
+            self.conn.execute("UPDATE progress SET done = 1 WHERE path = ?", (os.path.abspath(file_path),))
+
+    def has_progress(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM progress").fetchone()[0] > 0
+
+    def clear(self):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM progress")
+            self.conn.execute("DELETE FROM results")
+
+def scan_file(file_path, load_sheets, process_page, results, log_queue, checkpoint=None, sheets=None):
+    """
+    Scans every row of every sheet of file_path one page (chunk) at a time,
+    calling process_page(file_name, sheet_name, df, page_results, log_queue)
+    for each page. After each page the offset and that page's results are
+    written to checkpoint, and a STATUS message reports the progress; a file
+    interrupted earlier resumes after its last saved page. Once a sheet
+    fails to read, nothing more of the file is checkpointed, so a rerun
+    resumes at that sheet instead of past it. sheets, if given, is the set
+    of sheet indexes to scan; the others are skipped unread. Returns False
+    if any sheet (or the file itself) could not be read.
+    """
+    file_name = os.path.basename(file_path)
+    resume = checkpoint.resume_point(file_path) if checkpoint is not None else None
+    if resume is not None:
+        sheet_start, row_start, done, previous = resume
+        results.extend(previous)
+        if done:
+            log_queue.put(f"Already scanned {file_name}; reusing {len(previous)} results from the checkpoint.")
+            return True
+        log_queue.put(f"Resuming {file_name} at sheet {sheet_start + 1}, row {row_start + 1}")
+    else:
+        sheet_start, row_start = 0, 0
+        if checkpoint is not None:
+            checkpoint.start(file_path)
+    log_queue.put(f"Processing file: {file_name}")
+    loaded = False
+    failed = False
+    try:
+        for sheet_index, (sheet_name, chunks, total_rows) in enumerate(iter_sheets(file_path, load_sheets)):
+            loaded = True
+            scanned = False
+            try:
+                if sheet_index < sheet_start or (sheets is not None and sheet_index not in sheets):
+                    continue
+                scanned = True
+                for df in chunks:
+                    if df.empty:
+                        continue
+                    end = int(df.index[-1]) + 1
+                    if sheet_index == sheet_start and end <= row_start:
+                        continue
+                    if sheet_index == sheet_start and int(df.index[0]) < row_start:
+                        df = df[df.index >= row_start]
+                    page_results = []
+                    process_page(file_name, sheet_name, df, page_results, log_queue)
+                    results.extend(page_results)
+                    if checkpoint is not None and not failed:
+                        checkpoint.save_page(file_path, sheet_index, end, page_results)
+                    log_queue.put(f"STATUS: Processed row {end} of {total_rows if total_rows is not None else '?'} "
+                                  f"in {file_name} - {sheet_name}")
+            except Exception as e:
+                log_queue.put(f"Error reading sheet {sheet_name} in {file_name}: {e}")
+                failed = True
+            finally:
+                chunks.close()
+            # Only sheets read in full here move the checkpoint on; marking a
+            # skipped sheet would move it back behind the resume point, and
+            # marking a failed one would skip it for good.
+            if checkpoint is not None and scanned and not failed:
+                checkpoint.save_page(file_path, sheet_index + 1, 0, [])
+    except Exception as e:
+        log_queue.put(f"Error opening {file_name}: {e}")
+        failed = True
+    if not loaded:
+        log_queue.put(f"No sheets loaded from {file_name}.")
+    # A file with read errors is not marked done, so a rerun tries it again.
+    if checkpoint is not None and not failed:
+        checkpoint.finish(file_path)
+    return not failed
@@ -0,0 +1,305 @@
+import os
+import sys
+import pandas as pd
+import concurrent.futures
+import csv
+import argparse
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from char_policy import load_policy
+from paged_scan import ScanCheckpoint, scan_file
+from sheet_loaders import reader_for
+from web_fetch import scan_url, scan_urls
+from sheet_stream import list_sheet_names, load_frames
+
+# Allowed characters come from config.json, shared with cleaner.py.
+char_policy = load_policy()
+# Progress of the current scan, so an interrupted run resumes where it stopped.
+checkpoint = ScanCheckpoint(os.path.join(os.path.dirname(os.path.abspath(__file__)), "scan_checkpoint.sqlite"))
+# Folder mode defaults: worker processes (None = one per CPU) and whether
+# multi-sheet .xlsx/.xlsm workbooks are split into one task per sheet. The
+# command line overrides them with --workers / --split_sheets.
+FOLDER_WORKERS = None
+FOLDER_SPLIT_SHEETS = True
+supported_extensions = (
+    ".xls", ".xlsx", ".xlsm", ".xlsb", ".gsheet", ".ods", ".csv", ".tsv", ".numbers",
+    ".123", ".wk1", ".wk3", ".wk4", ".qpw", ".wb1", ".wb2", ".wb3", ".slk", ".dif", ".xml"
+)
+
+def load_sheets(file_path):
+    ext = os.path.splitext(file_path)[1].lower()
+    if reader_for(file_path) is not None:
+        # .xlsx/.xlsm, .xlsb, .ods, .slk and .dif have their own row readers.
+        try:
+            return load_frames(file_path)
+        except Exception:
+            return {}
+    elif ext == ".xls":
+        try:
+            xls = pd.ExcelFile(file_path)
+        except Exception:
+            return {}
+        sheets = {}
+        for sheet_name in xls.sheet_names:
+            try:
+                sheets[sheet_name] = pd.read_excel(xls, sheet_name=sheet_name, dtype=str)
+            except Exception:
+                continue
+        return sheets
+    elif ext == ".csv":
+        try:
+            df = pd.read_csv(file_path, dtype=str, encoding="utf-8", errors="replace")
+            return {"Sheet1": df}
+        except Exception:
+            return {}
+    elif ext == ".tsv":
+        try:
+            df = pd.read_csv(file_path, dtype=str, sep="\t", encoding="utf-8", errors="replace")
+            return {"Sheet1": df}
+        except Exception:
+            return {}
+    elif ext == ".xml":
+        try:
+            df = pd.read_xml(file_path)
+            return {"Sheet1": df}
+        except Exception:
+            return {}
+    else:
+        return {}
+
+def process_df(file_name, sheet_name, df, results, log_queue):
+    emplid_column = None
+    for col in df.columns:
+        if "EMPLID" in col.upper():
+            emplid_column = col
+            break
+    found = len(results)
+    for row_idx, row in df.iterrows():
+        emplid_value = row[emplid_column] if emplid_column in df.columns else "N/A"
+        for col_idx, cell_value in enumerate(row):
+            if pd.notna(cell_value):
+                cell_str = str(cell_value)
+                special_chars, non_latin_chars = char_policy.offending(cell_str)
+                if special_chars or non_latin_chars:
+                    results.append({
+                        "File Name": file_name,
+                        "Sheet Name": sheet_name,
+                        "EMPLID": emplid_value,
+                        "Row": row_idx + 1,
+                        "Column": df.columns[col_idx],
+                        "Original Cell Value": cell_str,
+                        "Special Characters": special_chars,
+                        "Non-Latin Characters": non_latin_chars
+                    })
+    # One message per page rather than per flagged cell.
+    if len(results) > found:
+        log_queue.put(f"Flagged {len(results) - found} cells in {file_name} - {sheet_name} "
+                      f"(rows {int(df.index[0]) + 1}-{int(df.index[-1]) + 1})")
+
+def process_file(file_path, results, log_queue):
+    # Every row is scanned, one page at a time, with progress checkpointed.
+    scan_file(file_path, load_sheets, process_df, results, log_queue, checkpoint)
+
+def process_web_link(url, results, log_queue):
+    try:
+        log_queue.put(f"Downloading file from URL: {url}")
+        scan_url(url, process_file, process_df, results, log_queue)
+    except Exception as e:
+        log_queue.put(f"Error processing web link {url}: {e}")
+
+def process_web_links(urls, results, log_queue):
+    # Several URLs (whitespace separated) are downloaded concurrently through
+    # the pooled session.
+    scan_urls(urls.split(), process_web_link, results, log_queue)
+
+class LogBuffer:
+    """
+    Stands in for log_queue inside a worker process; the collected messages
+    are sent back to the GUI process together with the results.
+    """
+    def __init__(self):
+        self.messages = []
+
+    def put(self, message):
+        self.messages.append(message)
+
+class CsvReport:
+    """
+    Appends result rows to a CSV file as they arrive. The header is taken
+    from the first row written; nothing is created if no row ever comes.
+    """
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.file = None
+        self.writer = None
+        self.rows = 0
+
+    def write(self, results):
+        if not results:
+            return
+        if self.writer is None:
+            self.file = open(self.output_file, "w", newline="", encoding="utf-8")
+            self.writer = csv.DictWriter(self.file, fieldnames=list(results[0].keys()))
+            self.writer.writeheader()
+        self.writer.writerows(results)
+        self.rows += len(results)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+def scan_task(file_path, sheet_index=None):
+    # Runs in a worker process: scans one file, or one sheet of it. Returns
+    # (results, log messages, whether every sheet could be read).
+    log = LogBuffer()
+    results = []
+    ok = scan_file(file_path, load_sheets, process_df, results, log,
+                   sheets=None if sheet_index is None else {sheet_index})
+    return results, log.messages, ok
+
+def iter_folder_tasks(folder_path, split_sheets=FOLDER_SPLIT_SHEETS):
+    # Yields (file_path, sheet_indexes) as the tree is walked; [None] means
+    # the whole file is one task.
+    for root, _, files in os.walk(folder_path):
+        for file in files:
+            if os.path.splitext(file)[1].lower() not in supported_extensions:
+                continue
+            file_path = os.path.join(root, file)
+            sheet_names = None
+            if split_sheets:
+                try:
+                    sheet_names = list_sheet_names(file_path)
+                except Exception:
+                    sheet_names = None
+            if sheet_names and len(sheet_names) > 1:
+                yield file_path, list(range(len(sheet_names)))
+            else:
+                yield file_path, [None]
+
+def process_folder_parallel(folder_path, output_file, log_queue, workers=FOLDER_WORKERS,
+                            split_sheets=FOLDER_SPLIT_SHEETS):
+    """
+    Scans a folder with a process pool. Files are submitted while the tree is
+    still being walked, with at most two tasks per worker in flight, and
+    each task's log messages and result rows are passed on to log_queue and
+    the CSV report as soon as it finishes. The checkpoint is kept per file,
+    so a rerun after an interruption skips the files already finished.
+    Returns the number of report rows written.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = 2 * workers
+    report = CsvReport(output_file)
+    pending = {}
+    remaining = {}
+    failed = set()
+
+    def collect(done):
+        for future in done:
+            file_path = pending.pop(future)
+            try:
+                results, messages, ok = future.result()
+            except Exception as e:
+                results, messages, ok = [], [f"Error processing {os.path.basename(file_path)}: {e}"], False
+            if not ok:
+                failed.add(file_path)
+            for message in messages:
+                log_queue.put(message)
+            report.write(results)
+            checkpoint.save_page(file_path, 0, 0, results)
+            remaining[file_path] -= 1
+            if remaining[file_path] == 0 and file_path not in failed:
+                checkpoint.finish(file_path)
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            for file_path, sheet_indexes in iter_folder_tasks(folder_path, split_sheets):
+                resume = checkpoint.resume_point(file_path)
+                if resume is not None and resume[2]:
+                    log_queue.put(f"Already scanned {os.path.basename(file_path)}; reusing its results.")
+                    report.write(resume[3])
+                    continue
+                checkpoint.start(file_path)
+                remaining[file_path] = len(sheet_indexes)
+                for sheet_index in sheet_indexes:
+                    while len(pending) >= max_pending:
+                        collect(concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED).done)
+                    pending[executor.submit(scan_task, file_path, sheet_index)] = file_path
+            while pending:
+                collect(concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED).done)
+    finally:
+        report.close()
+    return report.rows
+
+def run_scan(input_type, user_input, output_file, log_queue, workers=FOLDER_WORKERS,
+             split_sheets=FOLDER_SPLIT_SHEETS):
+    """
+    Runs one scan ("file", "folder" or "web") and writes the CSV report to
+    output_file. Returns the number of report rows; nothing is written when
+    it is 0. workers and split_sheets configure the folder mode's process
+    pool. Used by both the GUI and the command line.
+    """
+    results = []
+    written = 0
+    if checkpoint.has_progress():
+        log_queue.put("Resuming the interrupted scan from its checkpoint.")
+    if input_type == "web":
+        process_web_links(user_input, results, log_queue)
+    elif input_type == "file":
+        if os.path.isfile(user_input):
+            process_file(user_input, results, log_queue)
+        else:
+            log_queue.put("Invalid file path.")
+    elif input_type == "folder":
+        if os.path.isdir(user_input):
+            # Rows go straight to the report instead of results.
+            written = process_folder_parallel(user_input, output_file, log_queue, workers, split_sheets)
+        else:
+            log_queue.put("Invalid folder path.")
+    if results:
+        df_output = pd.DataFrame(results)
+        df_output.to_csv(output_file, index=False, encoding="utf-8")
+        written = len(results)
+    if written:
+        log_queue.put(f"Scan report saved: {output_file}")
+    else:
+        log_queue.put("No unwanted special characters found.")
+    # The run finished, so the next one starts from scratch.
+    checkpoint.clear()
+    return written
+
+class ConsoleLog:
+    """
+    log_queue for the command line: messages are printed as they come and
+    STATUS progress is only echoed when verbose.
+    """
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+
+    def put(self, message):
+        if message.startswith("STATUS:"):
+            if self.verbose:
+                print(message.replace("STATUS:", "").strip(), file=sys.stderr)
+        else:
+            print(message)
+
+def main():
+    parser = argparse.ArgumentParser(description="Scan sheets for special and non-Latin characters.")
+    parser.add_argument("input_type", choices=["file", "folder", "web"])
+    parser.add_argument("input", help="File or folder path, or whitespace-separated URLs")
+    parser.add_argument("--output", default=os.path.join(os.getcwd(), "scanned_report.csv"),
+                        help="CSV report path (default: ./scanned_report.csv)")
+    parser.add_argument("--verbose", action="store_true", help="Also print page progress")
+    parser.add_argument("--workers", type=int, default=FOLDER_WORKERS,
+                        help="Worker processes for folder scans (default: one per CPU)")
+    parser.add_argument("--split_sheets", action=argparse.BooleanOptionalAction, default=FOLDER_SPLIT_SHEETS,
+                        help="Scan the sheets of multi-sheet .xlsx/.xlsm workbooks as separate tasks "
+                             "in folder mode (default: on)")
+    args = parser.parse_args()
+    run_scan(args.input_type, args.input, args.output, ConsoleLog(args.verbose),
+             args.workers, args.split_sheets)
+
+if __name__ == "__main__":
+    main()
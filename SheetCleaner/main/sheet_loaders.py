@@ -0,0 +1,240 @@
+import os
+import zipfile
+import xml.etree.ElementTree as ET
+
+# OPTIONAL: pyxlsb reads .xlsb workbooks row by row
+try:
+    from pyxlsb import open_workbook as open_xlsb
+except ImportError:
+    open_xlsb = None
+
+# Row readers by file extension. A reader takes a file path and yields
+# (sheet_name, rows, total_rows) per sheet, where rows lazily yields one
+# tuple of cell values per row (header row first) and total_rows is the
+# number of data rows when it is known up front, else None. Each rows
+# iterator is consumed (or abandoned) before the next sheet is asked for.
+ROW_READERS = {}
+
+def register_reader(*extensions):
+    def decorator(reader):
+        for ext in extensions:
+            ROW_READERS[ext] = reader
+        return reader
+    return decorator
+
+def reader_for(file_path):
+    return ROW_READERS.get(os.path.splitext(file_path)[1].lower())
+
+def text_encoding(file_path, sample_bytes=65536):
+    # Legacy text formats are often cp1252; use UTF-8 only if the start of
+    # the file decodes as UTF-8.
+    with open(file_path, "rb") as f:
+        sample = f.read(sample_bytes)
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the end of the sample is fine.
+        if e.start < len(sample) - 3:
+            return "cp1252"
+    return "utf-8"
+
+@register_reader(".xlsx", ".xlsm")
+def read_xlsx(file_path):
+    from openpyxl import load_workbook
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            # max_row comes from the sheet's stored dimension and includes
+            # the header; it is None when the file does not record one.
+            total_rows = ws.max_row - 1 if ws.max_row else None
+            yield ws.title, ws.iter_rows(values_only=True), total_rows
+    finally:
+        wb.close()
+
+@register_reader(".xlsb")
+def read_xlsb(file_path):
+    if open_xlsb is None:
+        raise ImportError("pyxlsb is required for .xlsb files (pip install pyxlsb)")
+    with open_xlsb(file_path) as wb:
+        for sheet_name in wb.sheets:
+            with wb.get_sheet(sheet_name) as sheet:
+                yield sheet_name, (tuple(cell.v for cell in row) for row in sheet.rows()), None
+
+ODF_TABLE = "{urn:oasis:names:tc:opendocument:xmlns:table:1.0}"
+ODF_OFFICE = "{urn:oasis:names:tc:opendocument:xmlns:office:1.0}"
+ODF_TEXT = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+ODF_VALUE_ATTRIBUTES = {
+    "float": "value", "percentage": "value", "currency": "value",
+    "date": "date-value", "time": "time-value", "boolean": "boolean-value",
+}
+
+def ods_cell_value(cell):
+    value_type = cell.get(ODF_OFFICE + "value-type")
+    attribute = ODF_VALUE_ATTRIBUTES.get(value_type)
+    if attribute is not None:
+        return cell.get(ODF_OFFICE + attribute)
+    paragraphs = ["".join(p.itertext()) for p in cell.iter(ODF_TEXT + "p")]
+    return "\n".join(paragraphs) if paragraphs else None
+
+def ods_table_rows(events):
+    # Rows of the table whose start tag was just read. Blank rows are held
+    # back until a non-blank one follows, because ODS pads sheets with a
+    # single repeated blank row reaching the last row of the grid; trailing
+    # blank cells are dropped for the same reason.
+    blank_rows = 0
+    for event, elem in events:
+        if event != "end":
+            continue
+        if elem.tag == ODF_TABLE + "table-row":
+            values = []
+            for cell in elem:
+                if cell.tag in (ODF_TABLE + "table-cell", ODF_TABLE + "covered-table-cell"):
+                    values.extend([ods_cell_value(cell)] * int(cell.get(ODF_TABLE + "number-columns-repeated", "1")))
+            while values and values[-1] is None:
+                values.pop()
+            repeat = int(elem.get(ODF_TABLE + "number-rows-repeated", "1"))
+            elem.clear()
+            if not values:
+                blank_rows += repeat
+                continue
+            for _ in range(blank_rows):
+                yield ()
+            blank_rows = 0
+            row = tuple(values)
+            for _ in range(repeat):
+                yield row
+        elif elem.tag == ODF_TABLE + "table":
+            elem.clear()
+            return
+
+@register_reader(".ods")
+def read_ods(file_path):
+    # content.xml is parsed incrementally, so only the current row is ever
+    # held in memory.
+    with zipfile.ZipFile(file_path) as zf, zf.open("content.xml") as content:
+        events = ET.iterparse(content, events=("start", "end"))
+        for event, elem in events:
+            if event == "start" and elem.tag == ODF_TABLE + "table":
+                rows = ods_table_rows(events)
+                yield elem.get(ODF_TABLE + "name"), rows, None
+                # Skip whatever the caller did not read of this sheet.
+                for _ in rows:
+                    pass
+
+def sylk_fields(line):
+    # ";;" is an escaped semicolon inside a field.
+    if ";;" not in line:
+        return line.split(";")
+    fields = []
+    field = []
+    i = 0
+    while i < len(line):
+        if line[i] == ";":
+            if line[i + 1:i + 2] == ";":
+                field.append(";")
+                i += 2
+                continue
+            fields.append("".join(field))
+            field = []
+        else:
+            field.append(line[i])
+        i += 1
+    fields.append("".join(field))
+    return fields
+
+def sylk_value(value):
+    if value.startswith('"'):
+        return value[1:-1] if value.endswith('"') and len(value) > 1 else value[1:]
+    return value
+
+def sylk_rows(file_path):
+    """
+    Rows of a SYLK file from its C (cell) records. A record without Y or X
+    keeps the previous row or column, as in the format. Cells are expected
+    in row order, which is how Excel and LibreOffice write them. Rows above
+    the lowest Y present are not emitted, so that row is the header even
+    when the sheet does not start at Y1.
+    """
+    row_y = None
+    cells = {}
+    x = y = 1
+    # Y of the last row yielded (blank or not); set from the first row found.
+    emitted = None
+    with open(file_path, encoding=text_encoding(file_path), errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if line == "E":
+                break
+            if not line.startswith("C;"):
+                continue
+            value = None
+            for field in sylk_fields(line)[1:]:
+                if field[:1] == "Y":
+                    y = int(field[1:])
+                elif field[:1] == "X":
+                    x = int(field[1:])
+                elif field[:1] == "K":
+                    value = sylk_value(field[1:])
+            if value is None:
+                continue
+            if y != row_y:
+                if row_y is not None:
+                    if y < row_y:
+                        raise ValueError(f"SYLK cells are not in row order (row {y} after row {row_y})")
+                    for _ in range(row_y - emitted - 1):
+                        yield ()
+                    yield tuple(cells.get(i) for i in range(1, max(cells) + 1))
+                    emitted = row_y
+                else:
+                    emitted = y - 1
+                row_y = y
+                cells = {}
+            cells[x] = value
+    if cells:
+        for _ in range(row_y - emitted - 1):
+            yield ()
+        yield tuple(cells.get(i) for i in range(1, max(cells) + 1))
+
+@register_reader(".slk")
+def read_sylk(file_path):
+    yield "Sheet1", sylk_rows(file_path), None
+
+def dif_rows(file_path):
+    """
+    Rows of a DIF file. The header is a run of (topic, "vector,value",
+    "string") line triples ending with DATA; after it every value is a
+    "type,number" line plus a string line, and -1,0 BOT starts each row.
+    """
+    with open(file_path, encoding=text_encoding(file_path), errors="replace") as f:
+        lines = (line.rstrip("\r\n") for line in f)
+        for topic in lines:
+            next(lines, None)
+            next(lines, None)
+            if topic.strip().upper() == "DATA":
+                break
+        row = None
+        for header in lines:
+            kind, _, number = header.partition(",")
+            text = next(lines, "").strip()
+            kind = kind.strip()
+            if kind == "-1":
+                if text == "BOT":
+                    if row is not None:
+                        yield tuple(row)
+                    row = []
+                elif text == "EOD":
+                    break
+                continue
+            if row is None:
+                row = []
+            if kind == "0":
+                # V marks a plain number; TRUE, FALSE, NA and ERROR stand alone.
+                row.append(number.strip() if text == "V" else text)
+            elif kind == "1":
+                row.append(text[1:-1].replace('""', '"') if text.startswith('"') and len(text) > 1 else text)
+        if row is not None:
+            yield tuple(row)
+
+@register_reader(".dif")
+def read_dif(file_path):
+    yield "Sheet1", dif_rows(file_path), None
@@ -0,0 +1,98 @@
+import os
+import pandas as pd
+
+from sheet_loaders import reader_for
+
+# Rows per chunk handed to process_df when streaming a sheet.
+CHUNK_ROWS = 10000
+
+def header_names(row):
+    # Same header rules as pandas: blank headers become "Unnamed: i" and
+    # repeated names get ".1", ".2", ... suffixes.
+    names = []
+    seen = {}
+    for i, value in enumerate(row):
+        name = f"Unnamed: {i}" if value is None else str(value)
+        base = name
+        while name in seen:
+            seen[base] += 1
+            name = f"{base}.{seen[base]}"
+        seen[name] = 0
+        names.append(name)
+    return names
+
+def rows_to_frame(rows, columns, start):
+    # Cells become strings like read_excel(dtype=str); the index continues
+    # from the previous chunk so row numbers stay relative to the sheet.
+    width = len(columns)
+    data = [[None if v is None else str(v) for v in row[:width]] + [None] * (width - len(row))
+            for row in rows]
+    return pd.DataFrame(data, columns=columns, index=pd.RangeIndex(start, start + len(data)), dtype=object)
+
+def iter_row_chunks(rows, chunk_rows):
+    # rows: tuples of cell values, header first (see sheet_loaders).
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return
+    columns = header_names(header)
+    batch = []
+    start = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= chunk_rows:
+            yield rows_to_frame(batch, columns, start)
+            start += len(batch)
+            batch = []
+    if batch:
+        yield rows_to_frame(batch, columns, start)
+
+def load_frames(file_path):
+    # Whole-sheet DataFrames for load_sheets, built from a registered row reader.
+    reader = reader_for(file_path)
+    sheets = {}
+    for sheet_name, rows, _ in reader(file_path):
+        frames = list(iter_row_chunks(rows, CHUNK_ROWS))
+        if frames:
+            sheets[sheet_name] = pd.concat(frames) if len(frames) > 1 else frames[0]
+    return sheets
+
+def list_sheet_names(file_path):
+    # Sheet names of an .xlsx/.xlsm workbook (read from its index only), or
+    # None for formats that have to be loaded whole anyway.
+    if os.path.splitext(file_path)[1].lower() not in (".xlsx", ".xlsm"):
+        return None
+    from openpyxl import load_workbook
+    wb = load_workbook(file_path, read_only=True)
+    try:
+        return wb.sheetnames
+    finally:
+        wb.close()
+
+def iter_frame_chunks(df, chunk_rows):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+def iter_sheets(file_path, load_sheets, chunk_rows=CHUNK_ROWS):
+    """
+    Yields (sheet_name, chunks, total_rows) for a file, where chunks iterates
+    DataFrames of at most chunk_rows rows and total_rows is the sheet's row
+    count when it is known up front. Formats with a row reader in
+    sheet_loaders (.xlsx/.xlsm, .xlsb, .ods, .slk, .dif) are read lazily and
+    .csv/.tsv with chunked read_csv, so only one chunk is in memory at a
+    time. Other formats go through load_sheets and are sliced afterwards.
+    Consume (or abandon) each chunks iterator before asking for the next
+    sheet.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    reader = reader_for(file_path)
+    if reader is not None:
+        for sheet_name, rows, total_rows in reader(file_path):
+            yield sheet_name, iter_row_chunks(rows, chunk_rows), total_rows
+    elif ext in (".csv", ".tsv"):
+        sep = "\t" if ext == ".tsv" else ","
+        yield "Sheet1", pd.read_csv(file_path, dtype=str, sep=sep, encoding="utf-8",
+                                    encoding_errors="replace", chunksize=chunk_rows), None
+    else:
+        for sheet_name, df in load_sheets(file_path).items():
+            yield sheet_name, iter_frame_chunks(df, chunk_rows), len(df)
@@ -0,0 +1,203 @@
+import io
+import os
+import shutil
+import zipfile
+import tempfile
+import concurrent.futures
+from urllib.parse import urlparse
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from sheet_stream import CHUNK_ROWS
+
+# Downloads larger than this are abandoned (and never fully buffered).
+MAX_DOWNLOAD_BYTES = 200 * 1024 * 1024
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+# (connect, read) timeouts in seconds.
+DOWNLOAD_TIMEOUT = (10, 60)
+SNIFF_BYTES = 2048
+# URLs of one request downloaded at the same time (within the session's pool).
+WEB_WORKERS = 4
+
+MAGIC_BYTES = (
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", ".xls"),  # OLE2 compound file
+    (b"PK\x03\x04", ".zip"),                      # xlsx/xlsm/xlsb/ods/numbers
+    (b"ID;", ".slk"),
+    (b"TABLE\r\n", ".dif"),
+    (b"TABLE\n", ".dif"),
+    (b"<?xml", ".xml"),
+)
+CONTENT_TYPES = {
+    "text/csv": ".csv",
+    "application/csv": ".csv",
+    "text/tab-separated-values": ".tsv",
+    "application/vnd.ms-excel": ".xls",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": ".xlsx",
+    "application/vnd.ms-excel.sheet.macroenabled.12": ".xlsm",
+    "application/vnd.ms-excel.sheet.binary.macroenabled.12": ".xlsb",
+    "application/vnd.oasis.opendocument.spreadsheet": ".ods",
+}
+# Binary formats are only trusted from their magic bytes: a Content-Type or
+# URL suffix naming one of them on a body without the signature is usually
+# CSV or HTML (servers and Windows send CSV as application/vnd.ms-excel).
+SIGNED_FORMATS = {".xls", ".xlsx", ".xlsm", ".xlsb", ".ods", ".numbers"}
+
+class DownloadTooLarge(Exception):
+    pass
+
+def make_session(pool_size=10):
+    # One pooled session per process: consecutive downloads from the same
+    # host reuse their keep-alive connections.
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+session = make_session()
+
+class DownloadStream(io.RawIOBase):
+    """
+    Read-only file object over a streamed response body. Bytes are pulled
+    from the network only as the reader asks for them, and reading past
+    max_bytes raises DownloadTooLarge. peek() looks at the start of the body
+    without consuming it, for format sniffing.
+    """
+
+    def __init__(self, response, max_bytes=MAX_DOWNLOAD_BYTES):
+        self.chunks = response.iter_content(DOWNLOAD_CHUNK_BYTES)
+        self.max_bytes = max_bytes
+        self.received = 0
+        self.buffer = b""
+        self.offset = 0
+
+    def readable(self):
+        return True
+
+    def _fetch(self):
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            return False
+        self.received += len(chunk)
+        if self.received > self.max_bytes:
+            raise DownloadTooLarge(f"download exceeds {self.max_bytes} bytes")
+        self.buffer = self.buffer[self.offset:] + chunk
+        self.offset = 0
+        return True
+
+    def peek(self, size):
+        while len(self.buffer) - self.offset < size and self._fetch():
+            pass
+        return self.buffer[self.offset:self.offset + size]
+
+    def readinto(self, b):
+        while self.offset >= len(self.buffer):
+            if not self._fetch():
+                return 0
+        n = min(len(b), len(self.buffer) - self.offset)
+        b[:n] = self.buffer[self.offset:self.offset + n]
+        self.offset += n
+        return n
+
+def sniff_format(head, content_type, url):
+    """
+    File extension for a download: magic bytes first, then the Content-Type
+    header, then the URL suffix, and finally a comma/tab count on the first
+    line of what is assumed to be text. Header and suffix are ignored when
+    they name a SIGNED_FORMATS type whose signature is missing. ZIP
+    containers come back as ".zip" and are told apart with zip_format once
+    the file is on disk.
+    """
+    for magic, ext in MAGIC_BYTES:
+        if head.startswith(magic):
+            return ext
+    mime = content_type.split(";")[0].strip().lower()
+    if CONTENT_TYPES.get(mime) not in (None, *SIGNED_FORMATS):
+        return CONTENT_TYPES[mime]
+    suffix = os.path.splitext(urlparse(url).path)[1].lower()
+    if suffix and suffix not in SIGNED_FORMATS:
+        return suffix
+    first_line = head.decode("utf-8", errors="ignore").lstrip("\ufeff").split("\n", 1)[0]
+    return ".tsv" if first_line.count("\t") > first_line.count(",") else ".csv"
+
+def zip_format(path):
+    # Which spreadsheet format a ZIP container holds, or None.
+    with zipfile.ZipFile(path) as zf:
+        names = set(zf.namelist())
+        if "mimetype" in names and b"spreadsheet" in zf.read("mimetype"):
+            return ".ods"
+        if "xl/workbook.bin" in names:
+            return ".xlsb"
+        if "xl/vbaProject.bin" in names:
+            return ".xlsm"
+        if "xl/workbook.xml" in names:
+            return ".xlsx"
+        if any(name.startswith("Index/") for name in names):
+            return ".numbers"
+    return None
+
+def scan_csv_stream(stream, ext, file_name, process_page, results, log_queue, chunk_rows=CHUNK_ROWS):
+    # Parses CSV/TSV straight off the wire, one page at a time, so scanning
+    # starts before the download has finished.
+    sep = "\t" if ext == ".tsv" else ","
+    reader = pd.read_csv(io.BufferedReader(stream, DOWNLOAD_CHUNK_BYTES), dtype=str, sep=sep,
+                         encoding="utf-8", encoding_errors="replace", chunksize=chunk_rows)
+    log_queue.put(f"Processing file: {file_name}")
+    with reader:
+        for df in reader:
+            if df.empty:
+                continue
+            process_page(file_name, "Sheet1", df, results, log_queue)
+            log_queue.put(f"STATUS: Processed row {int(df.index[-1]) + 1} of ? in {file_name} - Sheet1 "
+                          f"({stream.received // 1024} KB downloaded)")
+
+def scan_url(url, process_file, process_page, results, log_queue, max_bytes=MAX_DOWNLOAD_BYTES):
+    """
+    Streams url to the scanner through the shared session. CSV/TSV bodies
+    are parsed while they download; anything else is written to a temp file
+    in chunks (never held in memory whole), given the sniffed extension and
+    handed to process_file. Raises DownloadTooLarge past max_bytes.
+    """
+    file_name = os.path.basename(urlparse(url).path) or url
+    with session.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        response.raise_for_status()
+        length = response.headers.get("Content-Length", "")
+        if length.isdigit() and int(length) > max_bytes:
+            raise DownloadTooLarge(f"{length} bytes is over the {max_bytes} byte limit")
+        stream = DownloadStream(response, max_bytes)
+        ext = sniff_format(stream.peek(SNIFF_BYTES), response.headers.get("Content-Type", ""), url)
+        if ext in (".csv", ".tsv"):
+            scan_csv_stream(stream, ext, file_name, process_page, results, log_queue)
+            return
+        fd, temp_file_path = tempfile.mkstemp(suffix=ext)
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                shutil.copyfileobj(stream, tmp_file, DOWNLOAD_CHUNK_BYTES)
+            if ext == ".zip":
+                real_ext = zip_format(temp_file_path)
+                if real_ext is None:
+                    raise ValueError("ZIP download does not contain a spreadsheet")
+                os.replace(temp_file_path, temp_file_path[:-len(ext)] + real_ext)
+                temp_file_path = temp_file_path[:-len(ext)] + real_ext
+            log_queue.put(f"Downloaded {stream.received} bytes to {temp_file_path}")
+            process_file(temp_file_path, results, log_queue)
+        finally:
+            if os.path.exists(temp_file_path):
+                os.remove(temp_file_path)
+
+def scan_urls(urls, process_web_link, results, log_queue, workers=WEB_WORKERS):
+    """
+    Runs process_web_link(url, results, log_queue) for several URLs on a
+    small thread pool, so their downloads share the session's connection
+    pool at the same time. Each URL collects its own rows, which are added
+    to results in the order the URLs were given.
+    """
+    url_results = [[] for _ in urls]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls)))) as executor:
+        for future in [executor.submit(process_web_link, url, rows, log_queue)
+                       for url, rows in zip(urls, url_results)]:
+            future.result()
+    for rows in url_results:
+        results.extend(rows)
@@ -0,0 +1,42 @@
+import os
+import sys
+import inspect
+import unittest
+import importlib.util
+
+MAIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "main")
+EXCEL_CLEANER_POLICY = os.path.join(MAIN_DIR, "..", "..", "Excel_Cleaner_V1", "main", "src", "char_policy.py")
+sys.path.insert(0, MAIN_DIR)
+
+import char_policy
+
+def load_excel_cleaner_policy():
+    spec = importlib.util.spec_from_file_location("excel_cleaner_char_policy", EXCEL_CLEANER_POLICY)
+    module = importlib.util.module_from_spec(spec)
+    # inspect.getsource finds a class's file through sys.modules.
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+class CharPolicyTest(unittest.TestCase):
+    @unittest.skipUnless(os.path.exists(EXCEL_CLEANER_POLICY), "Excel_Cleaner_V1 is not checked out alongside")
+    def test_copies_are_identical(self):
+        # Both projects ship their own copy of the policy; they must not drift.
+        other = load_excel_cleaner_policy()
+        for name in ("CharPolicy", "allowed_bmp"):
+            self.assertEqual(inspect.getsource(getattr(char_policy, name)), inspect.getsource(getattr(other, name)))
+
+    def test_lookup_table_matches_regex(self):
+        policy = char_policy.CharPolicy.from_config(char_policy.DEFAULT_CONFIG)
+        for cp in range(0x10000):
+            ch = chr(cp)
+            self.assertEqual(ch in policy.allowed, policy.pattern.match(ch) is None, hex(cp))
+
+    def test_offending(self):
+        policy = char_policy.CharPolicy.from_config(char_policy.DEFAULT_CONFIG)
+        self.assertEqual(policy.offending("plain text 42"), ("", ""))
+        self.assertEqual(policy.offending("a@b#a@"), ("#@", ""))
+        self.assertEqual(policy.offending("Zoë™ Őz €"), ("Ő€™", "ëŐ€™"))
+
+if __name__ == "__main__":
+    unittest.main()
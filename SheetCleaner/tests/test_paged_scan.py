@@ -0,0 +1,65 @@
+import os
+import sys
+import queue
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "main"))
+
+from paged_scan import ScanCheckpoint, scan_file
+
+SHEETS = {name: pd.DataFrame({"value": [f"{name}-{i}" for i in range(3)]}) for name in ("A", "B", "C")}
+
+class ScanFileCheckpointTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        # An extension without a row reader, so the sheets come from load_sheets.
+        self.file_path = os.path.join(self.folder, "book.sheets")
+        open(self.file_path, "w").close()
+        self.checkpoint = ScanCheckpoint(os.path.join(self.folder, "checkpoint.sqlite"))
+        self.pages = []
+
+    def tearDown(self):
+        self.checkpoint.conn.close()
+        shutil.rmtree(self.folder)
+
+    def scan(self, fail_sheet=None, interrupt_sheet=None):
+        def process_page(file_name, sheet_name, df, results, log_queue):
+            self.pages.append(sheet_name)
+            if sheet_name == interrupt_sheet:
+                raise KeyboardInterrupt
+            if sheet_name == fail_sheet:
+                raise ValueError("unreadable sheet")
+            results.extend(df["value"])
+
+        results = []
+        ok = scan_file(self.file_path, lambda path: SHEETS, process_page, results, queue.Queue(), self.checkpoint)
+        return ok, results
+
+    def test_interrupted_run_resumes_without_duplicates(self):
+        with self.assertRaises(KeyboardInterrupt):
+            self.scan(interrupt_sheet="B")
+        self.pages = []
+        ok, results = self.scan()
+        self.assertTrue(ok)
+        self.assertEqual(self.pages, ["B", "C"])
+        self.assertEqual(results, [value for df in SHEETS.values() for value in df["value"]])
+
+    def test_failed_sheet_is_scanned_again(self):
+        ok, _ = self.scan(fail_sheet="B")
+        self.assertFalse(ok)
+        sheet_index, row_offset, done, previous = self.checkpoint.resume_point(self.file_path)
+        self.assertEqual((sheet_index, row_offset, done), (1, 0, False))
+        self.assertEqual(previous, list(SHEETS["A"]["value"]))
+        self.pages = []
+        ok, results = self.scan()
+        self.assertTrue(ok)
+        self.assertEqual(self.pages, ["B", "C"])
+        self.assertEqual(results, [value for df in SHEETS.values() for value in df["value"]])
+        self.assertTrue(self.checkpoint.resume_point(self.file_path)[2])
+
+if __name__ == "__main__":
+    unittest.main()
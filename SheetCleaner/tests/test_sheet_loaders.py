@@ -0,0 +1,47 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "main"))
+
+from sheet_loaders import read_sylk
+from sheet_stream import load_frames
+
+# Header at Y3 (after a formatting-only record at Y1), data at Y4 and Y6.
+SYLK_NOT_AT_Y1 = "\r\n".join([
+    "ID;PWXL;N;E",
+    "F;W1 2 12",
+    "C;Y1;X1",
+    'C;Y3;X1;K"Name"',
+    'C;X2;K"City"',
+    'C;Y4;X1;K"José"',
+    'C;X2;K"Zürich"',
+    'C;Y6;X2;K"Oslo"',
+    "E",
+    "",
+])
+
+class SylkReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.folder, "offset.slk")
+        with open(self.file_path, "w", encoding="utf-8", newline="") as f:
+            f.write(SYLK_NOT_AT_Y1)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_header_is_lowest_row_present(self):
+        [(sheet_name, rows, _)] = list(read_sylk(self.file_path))
+        self.assertEqual(list(rows), [("Name", "City"), ("José", "Zürich"), (), (None, "Oslo")])
+
+    def test_frame_uses_header_names(self):
+        df = load_frames(self.file_path)["Sheet1"]
+        self.assertEqual(list(df.columns), ["Name", "City"])
+        self.assertEqual(df["City"].tolist()[0], "Zürich")
+        self.assertEqual(df["City"].tolist()[-1], "Oslo")
+
+if __name__ == "__main__":
+    unittest.main()